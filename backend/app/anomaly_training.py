@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, time, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import create_database_tables
+from app.database import gather_shards
+from app.services import active_daily_summaries
+from ml.anomaly_detector import feature_matrix, save_population_model
+
+
+def collect_feature_history(db: Session, training_days: int) -> list[dict[str, float]]:
+    window_end = datetime.combine(datetime.now(timezone.utc).date(), time.min)
+    window_start = window_end - timedelta(days=training_days)
+    return list(active_daily_summaries(db, window_start, window_end))
+
+
+def train_population_model(training_days: int | None = None) -> dict[str, object]:
+    from sklearn.ensemble import IsolationForest
+
+    training_days = settings.anomaly_training_days if training_days is None else training_days
+    shard_histories = gather_shards(lambda db: collect_feature_history(db, training_days))
+    matrix = feature_matrix([day for history in shard_histories for day in history])
+    if len(matrix) < 7:
+        raise ValueError("Need at least 7 daily vectors across all users to train the population model.")
+
+    model = IsolationForest(contamination=0.15, random_state=42)
+    model.fit(matrix)
+    path = save_population_model(model, len(matrix))
+    return {"artifact": str(path), "sample_count": len(matrix)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fit the population anomaly model on all users' daily feature vectors."
+    )
+    parser.add_argument("--training-days", type=int, default=settings.anomaly_training_days)
+    args = parser.parse_args()
+
+    create_database_tables()
+    print(train_population_model(args.training_days))
+
+
+if __name__ == "__main__":
+    main()
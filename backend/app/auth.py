@@ -10,7 +10,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, session_for_user
 from app.models import User
 from app.schemas import UserRegisterRequest
 
@@ -116,3 +116,11 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     if not current_user.is_active:
         raise HTTPException(status_code=403, detail="Inactive user.")
     return current_user
+
+
+def get_user_db(current_user: User = Depends(get_current_active_user)):
+    db = session_for_user(current_user.public_id)
+    try:
+        yield db
+    finally:
+        db.close()
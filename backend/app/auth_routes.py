@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.auth import authenticate_user, create_access_token, get_current_active_user, register_user
 from app.database import get_db
 from app.models import User
+from app.rate_limit import limit_auth_attempts
 from app.schemas import TokenResponse, UserLoginRequest, UserRegisterRequest, UserResponse
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -21,12 +22,17 @@ def _to_user_response(user: User) -> UserResponse:
     )
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_auth_attempts)],
+)
 def register(payload: UserRegisterRequest, db: Session = Depends(get_db)):
     user = register_user(db, payload)
     return _to_user_response(user)
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(limit_auth_attempts)])
 def login(payload: UserLoginRequest, db: Session = Depends(get_db)):
     user = authenticate_user(db, payload.username, payload.password)
     access_token = create_access_token(subject=user.public_id)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import gather_shards
+from app.models import ActivityRollup, CohortDailySketch, TeamMember
+from ml.quantile_sketch import KLLSketch
+
+SKETCH_METRICS = (
+    "productivity_score",
+    "deep_work_norm",
+    "engagement_norm",
+    "task_completion_norm",
+    "switch_norm",
+    "isolation_rate",
+)
+ORGANISATION_COHORT = "organisation"
+
+
+def team_cohort(db: Session, user_id: str) -> str | None:
+    team = db.scalar(select(TeamMember.team).where(TeamMember.user_id == user_id))
+    return None if team is None else f"team:{team}"
+
+
+def _day_values(db: Session, day: date) -> list[tuple[object, ...]]:
+    return db.execute(
+        select(ActivityRollup.user_id, *(getattr(ActivityRollup, metric) for metric in SKETCH_METRICS)).where(
+            ActivityRollup.resolution == "day",
+            ActivityRollup.period_start == day,
+        )
+    ).all()
+
+
+def rebuild_cohort_sketches(db: Session, days: set[date]) -> int:
+    teams = dict(db.execute(select(TeamMember.user_id, TeamMember.team)).all())
+    written = 0
+    for day in sorted(days):
+        sketches: dict[tuple[str, str], KLLSketch] = {}
+        for rows in gather_shards(lambda shard_db: _day_values(shard_db, day)):
+            for user_id, *values in rows:
+                cohorts = [ORGANISATION_COHORT]
+                if user_id in teams:
+                    cohorts.append(f"team:{teams[user_id]}")
+                for cohort in cohorts:
+                    for metric, value in zip(SKETCH_METRICS, values):
+                        sketch = sketches.setdefault((cohort, metric), KLLSketch(settings.cohort_sketch_k))
+                        sketch.update(value)
+
+        db.execute(delete(CohortDailySketch).where(CohortDailySketch.day == day))
+        if sketches:
+            db.execute(
+                insert(CohortDailySketch),
+                [
+                    {
+                        "cohort": cohort,
+                        "day": day,
+                        "metric": metric,
+                        "sample_count": sketch.count,
+                        "sketch": sketch.to_bytes(),
+                    }
+                    for (cohort, metric), sketch in sketches.items()
+                ],
+            )
+        db.commit()
+        written += len(sketches)
+    return written
+
+
+def merged_cohort_sketches(db: Session, cohort: str, start_date: date, end_date: date) -> dict[str, KLLSketch]:
+    query = select(CohortDailySketch.metric, CohortDailySketch.sketch).where(
+        CohortDailySketch.cohort == cohort,
+        CohortDailySketch.day >= start_date,
+        CohortDailySketch.day <= end_date,
+    )
+    merged = {metric: KLLSketch(settings.cohort_sketch_k) for metric in SKETCH_METRICS}
+    for metric, payload in db.execute(query):
+        if metric in merged:
+            merged[metric].merge(KLLSketch.from_bytes(payload))
+    return merged
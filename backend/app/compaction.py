@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+
+from sqlalchemy import delete, select, union
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import create_database_tables
+from app.database import gather_shards
+from app.models import DailyActivityAggregate, IdleEpisode, WorkLog
+from app.services import activity_days, compute_raw_day_totals, retention_cutoff
+
+
+def _compact_user(db: Session, user_id: str, cutoff: datetime) -> int:
+    already_compacted = set(
+        db.scalars(
+            select(DailyActivityAggregate.day).where(
+                DailyActivityAggregate.user_id == user_id,
+                DailyActivityAggregate.day < cutoff.date(),
+            )
+        ).all()
+    )
+    days = sorted(activity_days(db, user_id, None, cutoff) - already_compacted)
+    for day in days:
+        db.add(DailyActivityAggregate(user_id=user_id, day=day, **compute_raw_day_totals(db, user_id, day)))
+    db.commit()
+    return len(days)
+
+
+def _delete_in_chunks(
+    db: Session,
+    model: type[IdleEpisode] | type[WorkLog],
+    ended_column,
+    cutoff: datetime,
+    chunk_size: int,
+) -> int:
+    deleted = 0
+    while True:
+        ids = db.scalars(select(model.id).where(ended_column <= cutoff).limit(chunk_size)).all()
+        if not ids:
+            return deleted
+        db.execute(delete(model).where(model.id.in_(ids)))
+        db.commit()
+        deleted += len(ids)
+
+
+def compact_activity(db: Session, chunk_size: int | None = None) -> dict[str, int]:
+    chunk_size = settings.compaction_chunk_size if chunk_size is None else chunk_size
+    cutoff = retention_cutoff()
+
+    user_ids = db.scalars(
+        union(
+            select(WorkLog.user_id).where(WorkLog.session_started_at < cutoff),
+            select(IdleEpisode.user_id).where(IdleEpisode.idle_started_at < cutoff),
+        ),
+        bind_arguments={"mapper": WorkLog},
+    ).all()
+    compacted_days = sum(_compact_user(db, user_id, cutoff) for user_id in user_ids)
+
+    return {
+        "users": len(user_ids),
+        "compacted_days": compacted_days,
+        "deleted_work_logs": _delete_in_chunks(db, WorkLog, WorkLog.session_ended_at, cutoff, chunk_size),
+        "deleted_idle_episodes": _delete_in_chunks(
+            db, IdleEpisode, IdleEpisode.idle_ended_at, cutoff, chunk_size
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Roll raw activity rows older than the retention horizon into daily aggregates."
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.compaction_chunk_size)
+    args = parser.parse_args()
+
+    create_database_tables()
+    shard_results = gather_shards(lambda db: compact_activity(db, args.chunk_size))
+    print({key: sum(result[key] for result in shard_results) for key in shard_results[0]})
+
+
+if __name__ == "__main__":
+    main()
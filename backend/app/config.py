@@ -7,6 +7,12 @@ from dataclasses import dataclass
 @dataclass(frozen=True)
 class Settings:
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./productivity.db")
+    activity_shard_urls: tuple[str, ...] = tuple(
+        url.strip() for url in os.getenv("ACTIVITY_SHARD_URLS", "").split(",") if url.strip()
+    )
+    admin_usernames: tuple[str, ...] = tuple(
+        name.strip() for name in os.getenv("ADMIN_USERNAMES", "").split(",") if name.strip()
+    )
     jwt_secret_key: str = os.getenv("JWT_SECRET_KEY", "dev-only-change-this-secret")
     jwt_algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
@@ -17,6 +23,31 @@ class Settings:
     engagement_weight: float = float(os.getenv("ENGAGEMENT_WEIGHT", "0.3"))
     task_weight: float = float(os.getenv("TASK_WEIGHT", "0.3"))
     switch_penalty: float = float(os.getenv("SWITCH_PENALTY", "0.2"))
+    retention_horizon_days: int = int(os.getenv("RETENTION_HORIZON_DAYS", "180"))
+    compaction_chunk_size: int = int(os.getenv("COMPACTION_CHUNK_SIZE", "1000"))
+    scoring_profile_cache_seconds: int = int(os.getenv("SCORING_PROFILE_CACHE_SECONDS", "60"))
+    rescoring_chunk_size: int = int(os.getenv("RESCORING_CHUNK_SIZE", "500"))
+    anomaly_model_dir: str = os.getenv("ANOMALY_MODEL_DIR", "./models")
+    anomaly_model_version: int = int(os.getenv("ANOMALY_MODEL_VERSION", "0"))
+    anomaly_training_days: int = int(os.getenv("ANOMALY_TRAINING_DAYS", "180"))
+    ingestion_rate_per_second: float = float(os.getenv("INGESTION_RATE_PER_SECOND", "5"))
+    ingestion_burst: int = int(os.getenv("INGESTION_BURST", "50"))
+    analytics_rate_per_second: float = float(os.getenv("ANALYTICS_RATE_PER_SECOND", "2"))
+    analytics_burst: int = int(os.getenv("ANALYTICS_BURST", "20"))
+    auth_rate_per_second: float = float(os.getenv("AUTH_RATE_PER_SECOND", "1"))
+    auth_burst: int = int(os.getenv("AUTH_BURST", "10"))
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    max_in_flight_requests: int = int(os.getenv("MAX_IN_FLIGHT_REQUESTS", "256"))
+    feature_store_days: int = int(os.getenv("FEATURE_STORE_DAYS", "120"))
+    feature_store_max_users: int = int(os.getenv("FEATURE_STORE_MAX_USERS", "10000"))
+    feature_store_ttl_seconds: int = int(os.getenv("FEATURE_STORE_TTL_SECONDS", "300"))
+    ingestion_wal_dir: str = os.getenv("INGESTION_WAL_DIR", "")
+    ingestion_wal_segment_bytes: int = int(os.getenv("INGESTION_WAL_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+    ingestion_wal_flush_interval_seconds: float = float(os.getenv("INGESTION_WAL_FLUSH_INTERVAL_SECONDS", "1"))
+    ingestion_wal_flush_batch_size: int = int(os.getenv("INGESTION_WAL_FLUSH_BATCH_SIZE", "1000"))
+    ingestion_read_wait_seconds: float = float(os.getenv("INGESTION_READ_WAIT_SECONDS", "1"))
+    cohort_sketch_k: int = int(os.getenv("COHORT_SKETCH_K", "200"))
+    rollup_batch_size: int = int(os.getenv("ROLLUP_BATCH_SIZE", "500"))
 
 
 settings = Settings()
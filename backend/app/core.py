@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from app.database import Base, engine
+from app.database import ActivityBase, Base, engine, shard_engines
 from app import models  # noqa: F401
 
 
 def create_database_tables() -> None:
     Base.metadata.create_all(bind=engine)
+    for shard_engine in shard_engines:
+        ActivityBase.metadata.create_all(bind=shard_engine)
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from app.config import settings
 
+T = TypeVar("T")
+
 
 def _sqlite_connect_args(database_url: str) -> dict[str, bool]:
     if database_url.startswith("sqlite"):
@@ -12,13 +20,58 @@ def _sqlite_connect_args(database_url: str) -> dict[str, bool]:
     return {}
 
 
-engine = create_engine(
-    settings.database_url,
-    connect_args=_sqlite_connect_args(settings.database_url),
-    future=True,
-)
+def _create_engine(database_url: str):
+    return create_engine(
+        database_url,
+        connect_args=_sqlite_connect_args(database_url),
+        future=True,
+    )
+
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_insert(db: Session, model: type):
+    dialect_name = db.get_bind(mapper=model).dialect.name
+    insert = _UPSERT_INSERTS.get(dialect_name)
+    if insert is None:
+        raise RuntimeError(f"Upserts are not supported for the '{dialect_name}' dialect.")
+    return insert
+
+
+engine = _create_engine(settings.database_url)
+shard_engines = [_create_engine(url) for url in settings.activity_shard_urls] or [engine]
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
+ActivityBase = declarative_base()
+
+
+def shard_index(user_id: str) -> int:
+    digest = hashlib.blake2b(user_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % len(shard_engines)
+
+
+def shard_session(index: int) -> Session:
+    return SessionLocal(binds={Base: engine, ActivityBase: shard_engines[index]})
+
+
+def session_for_user(user_id: str) -> Session:
+    return shard_session(shard_index(user_id))
+
+
+def gather_shards(job: Callable[[Session], T]) -> list[T]:
+    def run(index: int) -> T:
+        db = shard_session(index)
+        try:
+            return job(db)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=len(shard_engines)) as pool:
+        return list(pool.map(run, range(len(shard_engines))))
 
 
 def get_db():
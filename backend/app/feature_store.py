@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from datetime import date
+from threading import Lock
+from time import monotonic
+
+import numpy as np
+
+from app.config import settings
+from ml.anomaly_detector import ANOMALY_FEATURE_KEYS
+from ml.burnout_detector import BURNOUT_FEATURE_KEYS
+from ml.scoring_parameters import ScoringParameters
+
+FEATURE_COLUMNS = tuple(dict.fromkeys((*ANOMALY_FEATURE_KEYS, "productivity_score", *BURNOUT_FEATURE_KEYS)))
+_COLUMN_INDEX = {name: index for index, name in enumerate(FEATURE_COLUMNS)}
+
+
+class UserFeatureHistory:
+    __slots__ = ("parameters", "day_ordinals", "filled_at", "invalidated_at", "values")
+
+    def __init__(self, capacity: int, parameters: ScoringParameters) -> None:
+        self.parameters = parameters
+        self.day_ordinals = array("q", [-1]) * capacity
+        self.filled_at = array("d", [0.0]) * capacity
+        self.invalidated_at = array("d", [0.0]) * capacity
+        self.values = np.zeros((capacity, len(FEATURE_COLUMNS)), dtype=np.float64)
+
+
+class FeatureWindow:
+    __slots__ = ("values",)
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = values
+
+    def column(self, name: str) -> list[float]:
+        return self.values[:, _COLUMN_INDEX[name]].tolist()
+
+    def columns(self, names: Iterable[str]) -> dict[str, list[float]]:
+        return {name: self.column(name) for name in names}
+
+    def matrix(self, names: Iterable[str]) -> list[list[float]]:
+        return self.values[:, [_COLUMN_INDEX[name] for name in names]].tolist()
+
+
+class FeatureHistoryStore:
+    def __init__(self, capacity_days: int, max_users: int, ttl_seconds: float) -> None:
+        self.capacity_days = capacity_days
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._histories: OrderedDict[str, UserFeatureHistory] = OrderedDict()
+        self._lock = Lock()
+
+    def _history(self, user_id: str, parameters: ScoringParameters) -> UserFeatureHistory:
+        history = self._histories.get(user_id)
+        if history is None or history.parameters != parameters:
+            history = UserFeatureHistory(self.capacity_days, parameters)
+            self._histories[user_id] = history
+            if len(self._histories) > self.max_users:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(user_id)
+        return history
+
+    def window(
+        self,
+        user_id: str,
+        parameters: ScoringParameters,
+        days: list[date],
+        compute_day: Callable[[date], dict[str, object]],
+    ) -> FeatureWindow:
+        values = np.empty((len(days), len(FEATURE_COLUMNS)), dtype=np.float64)
+        missing: list[int] = []
+        now = monotonic()
+
+        with self._lock:
+            history = self._history(user_id, parameters)
+            for position, day in enumerate(days):
+                slot = day.toordinal() % self.capacity_days
+                fresh = now - history.filled_at[slot] < self.ttl_seconds
+                if history.day_ordinals[slot] == day.toordinal() and fresh:
+                    values[position] = history.values[slot]
+                else:
+                    missing.append(position)
+
+        for position in missing:
+            summary = compute_day(days[position])
+            values[position] = [float(summary[name]) for name in FEATURE_COLUMNS]
+
+        with self._lock:
+            history = self._history(user_id, parameters)
+            for position in missing:
+                slot = days[position].toordinal() % self.capacity_days
+                if history.invalidated_at[slot] >= now:
+                    continue
+                history.day_ordinals[slot] = days[position].toordinal()
+                history.filled_at[slot] = now
+                history.values[slot] = values[position]
+
+        return FeatureWindow(values)
+
+    def invalidate(self, user_id: str, days: Iterable[date]) -> None:
+        with self._lock:
+            history = self._histories.get(user_id)
+            if history is None:
+                return
+            now = monotonic()
+            for day in days:
+                slot = day.toordinal() % self.capacity_days
+                history.invalidated_at[slot] = now
+                if history.day_ordinals[slot] == day.toordinal():
+                    history.day_ordinals[slot] = -1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histories.clear()
+
+
+feature_store = FeatureHistoryStore(
+    settings.feature_store_days,
+    settings.feature_store_max_users,
+    settings.feature_store_ttl_seconds,
+)
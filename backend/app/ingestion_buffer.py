@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from threading import Condition, Event, Lock, Thread
+from time import monotonic
+from uuid import uuid4
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import shard_index, shard_session
+from app.models import User
+from app.rate_limit import analytics_user
+
+ApplyRows = Callable[[Session, str, list[dict[str, object]]], None]
+_OWNER_LOCK = "owner.lock"
+
+
+def _encode(value: object) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot write {type(value).__name__} to an ingestion segment.")
+
+
+def _fsync_directory(directory: Path) -> None:
+    if os.name != "posix":
+        return
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _lock_owner(path: Path, create: bool = False):
+    import fcntl
+
+    try:
+        handle = open(path, "a" if create else "r+")
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        return None
+    return handle
+
+
+def _segments(directory: Path) -> list[tuple[int, Path]]:
+    return sorted((int(path.stem), path) for path in directory.glob("*.wal"))
+
+
+class IngestionBuffer:
+    def __init__(self, directory: str, segment_bytes: int, flush_interval: float, batch_size: int) -> None:
+        self.root = Path(directory) if directory else None
+        self.directory: Path | None = None
+        self._owner_lock = None
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._apply: ApplyRows | None = None
+        self._lock = Lock()
+        self._sync_lock = Lock()
+        self._flush_lock = Lock()
+        self._flushed = Condition(self._lock)
+        self._wake = Event()
+        self._stopping = Event()
+        self._thread: Thread | None = None
+        self._segment = None
+        self._segment_id = 0
+        self._segment_records = 0
+        self._segment_started: dict[int, float] = {}
+        self._sequence = 0
+        self._synced_sequence = 0
+        self._pending_by_user: Counter[str] = Counter()
+        self.fsyncs = 0
+        self.flushed_records = 0
+        self.replayed_records = 0
+        self.last_flush_at: float | None = None
+        self.last_error: str | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._segment is not None
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self.directory / f"{segment_id:012d}.wal"
+
+    def _sealed_segments(self) -> list[tuple[int, Path]]:
+        segments = _segments(self.directory)
+        return [(segment_id, path) for segment_id, path in segments if segment_id < self._segment_id]
+
+    def _open_segment(self, segment_id: int) -> None:
+        self._segment_id = segment_id
+        self._segment = open(self._segment_path(segment_id), "ab")
+        self._segment_records = 0
+        _fsync_directory(self.directory)
+
+    def _claim_directory(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"{os.getpid()}-{uuid4().hex[:8]}"
+        staging = self.root / f".{name}"
+        staging.mkdir()
+        self._owner_lock = _lock_owner(staging / _OWNER_LOCK, create=True)
+        self.directory = self.root / name
+        staging.rename(self.directory)
+        _fsync_directory(self.root)
+
+    def _replay_orphans(self) -> None:
+        for owner in sorted(self.root.iterdir()):
+            if owner == self.directory or owner.name.startswith(".") or not owner.is_dir():
+                continue
+            lock = _lock_owner(owner / _OWNER_LOCK)
+            if lock is None:
+                continue
+            try:
+                if not (owner / _OWNER_LOCK).exists():
+                    continue
+                for _, path in _segments(owner):
+                    self.replayed_records += self._flush_segment(path)
+                (owner / _OWNER_LOCK).unlink()
+                owner.rmdir()
+            finally:
+                lock.close()
+
+    def start(self, apply: ApplyRows) -> None:
+        if self.root is None or self._thread is not None:
+            return
+        self._apply = apply
+        self._claim_directory()
+        self._replay_orphans()
+        with self._lock:
+            self._open_segment(0)
+
+        self._stopping.clear()
+        self._thread = Thread(target=self._run, name="ingestion-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        self.flush()
+
+        with self._sync_lock, self._lock:
+            self._segment.close()
+            if self._segment_records == 0:
+                self._segment_path(self._segment_id).unlink(missing_ok=True)
+            self._segment = None
+
+        if not _segments(self.directory):
+            (self.directory / _OWNER_LOCK).unlink()
+            self.directory.rmdir()
+        self._owner_lock.close()
+        self._owner_lock = None
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as error:
+                self.last_error = repr(error)
+
+    def append(self, table: str, rows: list[dict[str, object]]) -> int:
+        lines = b"".join(
+            json.dumps({"table": table, "row": row}, default=_encode).encode() + b"\n" for row in rows
+        )
+        with self._lock:
+            if self._segment is None:
+                raise RuntimeError("Ingestion buffer is not running.")
+            self._segment.write(lines)
+            self._segment_records += len(rows)
+            self._segment_started.setdefault(self._segment_id, monotonic())
+            self._sequence += len(rows)
+            sequence = self._sequence
+            self._pending_by_user.update(row["user_id"] for row in rows)
+            full = self._segment.tell() >= self.segment_bytes
+
+        self._sync(sequence)
+        if full:
+            self._seal()
+        return sequence
+
+    def _sync(self, sequence: int) -> None:
+        with self._sync_lock:
+            if self._synced_sequence >= sequence:
+                return
+            with self._lock:
+                self._segment.flush()
+                target = self._sequence
+                descriptor = self._segment.fileno()
+            os.fsync(descriptor)
+            self._synced_sequence = target
+            self.fsyncs += 1
+
+    def _seal(self) -> None:
+        with self._sync_lock, self._lock:
+            if self._segment is None or self._segment_records == 0:
+                return
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._segment.close()
+            self._synced_sequence = self._sequence
+            self._open_segment(self._segment_id + 1)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            self._seal()
+            flushed = 0
+            for segment_id, path in self._sealed_segments():
+                flushed += self._flush_segment(path)
+                with self._lock:
+                    self._segment_started.pop(segment_id, None)
+            self.last_flush_at = monotonic()
+            self.last_error = None
+            return flushed
+
+    def _flush_segment(self, path: Path) -> int:
+        records = [
+            json.loads(line) for line in path.read_bytes().splitlines(keepends=True) if line.endswith(b"\n")
+        ]
+        by_shard: dict[int, dict[str, list[dict[str, object]]]] = {}
+        for record in records:
+            tables = by_shard.setdefault(shard_index(record["row"]["user_id"]), {})
+            tables.setdefault(record["table"], []).append(record["row"])
+
+        for index, tables in by_shard.items():
+            db = shard_session(index)
+            try:
+                for table, rows in tables.items():
+                    for offset in range(0, len(rows), self.batch_size):
+                        self._apply(db, table, rows[offset : offset + self.batch_size])
+            finally:
+                db.close()
+        path.unlink()
+
+        with self._flushed:
+            for user_id, count in Counter(record["row"]["user_id"] for record in records).items():
+                remaining = self._pending_by_user[user_id] - count
+                if remaining > 0:
+                    self._pending_by_user[user_id] = remaining
+                else:
+                    del self._pending_by_user[user_id]
+            self.flushed_records += len(records)
+            self._flushed.notify_all()
+        return len(records)
+
+    def wait_for_user(self, user_id: str, timeout: float) -> bool:
+        with self._flushed:
+            if not self._pending_by_user[user_id]:
+                return True
+            if timeout <= 0:
+                return False
+        self._wake.set()
+        with self._flushed:
+            return self._flushed.wait_for(lambda: not self._pending_by_user[user_id], timeout)
+
+    def stats(self) -> dict[str, object]:
+        now = monotonic()
+        with self._lock:
+            oldest = min(self._segment_started.values(), default=None)
+            return {
+                "enabled": self.enabled,
+                "pending_records": sum(self._pending_by_user.values()),
+                "pending_users": len(self._pending_by_user),
+                "pending_segments": len(self._segment_started),
+                "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+                "appended_records": self._sequence,
+                "flushed_records": self.flushed_records,
+                "replayed_records": self.replayed_records,
+                "fsyncs": self.fsyncs,
+                "last_flush_seconds_ago": (
+                    round(now - self.last_flush_at, 3) if self.last_flush_at is not None else None
+                ),
+                "last_error": self.last_error,
+            }
+
+
+ingestion_buffer = IngestionBuffer(
+    settings.ingestion_wal_dir,
+    settings.ingestion_wal_segment_bytes,
+    settings.ingestion_wal_flush_interval_seconds,
+    settings.ingestion_wal_flush_batch_size,
+)
+
+
+def flushed_analytics_user(current_user: User = Depends(analytics_user)) -> User:
+    ingestion_buffer.wait_for_user(current_user.public_id, settings.ingestion_read_wait_seconds)
+    return current_user
@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from app.auth_routes import router as auth_router
 from app.core import create_database_tables
+from app.ingestion_buffer import ingestion_buffer
+from app.rate_limit import get_rate_limit_stats, load_shedder
 from app.routes import router as activity_router
+from app.services import apply_buffered_rows
+from app.scoring_profile_routes import router as scoring_profile_router
 from fastapi.middleware.cors import CORSMiddleware
 
 
@@ -10,6 +14,7 @@ origins = [
     "http://localhost:8080",
 ]
 
+app.middleware("http")(load_shedder)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -21,11 +26,28 @@ app.add_middleware(
 @app.on_event("startup")
 def startup() -> None:
     create_database_tables()
+    ingestion_buffer.start(apply_buffered_rows)
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    ingestion_buffer.stop()
 
 
 app.include_router(auth_router)
 app.include_router(activity_router)
+app.include_router(scoring_profile_router)
 
 @app.get("/")
 def health_check():
     return {"status": "running", "service": "ai-productivity-engine"}
+
+
+@app.get("/metrics/rate-limits")
+def rate_limit_metrics():
+    return get_rate_limit_stats()
+
+
+@app.get("/metrics/ingestion")
+def ingestion_metrics():
+    return ingestion_buffer.stats()
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, func
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database import Base
+from app.database import ActivityBase, Base
 
 
 class User(Base):
@@ -26,8 +38,12 @@ class User(Base):
     )
 
 
-class IdleEpisode(Base):
+class IdleEpisode(ActivityBase):
     __tablename__ = "idle_episodes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "idle_started_at", "idle_ended_at", name="uq_idle_episodes_natural_key"),
+        Index("ix_idle_episodes_user_started_id", "user_id", "idle_started_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
@@ -39,8 +55,12 @@ class IdleEpisode(Base):
     )
 
 
-class WorkLog(Base):
+class WorkLog(ActivityBase):
     __tablename__ = "work_logs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "session_started_at", "session_ended_at", name="uq_work_logs_natural_key"),
+        Index("ix_work_logs_user_started_id", "user_id", "session_started_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
@@ -61,3 +81,135 @@ class WorkLog(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+
+DAILY_TOTAL_FIELDS = (
+    "isolation_count",
+    "total_isolation_minutes",
+    "longest_isolation_minutes",
+    "tracked_minutes",
+    "active_minutes",
+    "deep_work_minutes",
+    "context_switch_count",
+    "assigned_tasks",
+    "completed_tasks",
+    "break_minutes",
+    "late_night_minutes",
+    "weekend_minutes",
+    "engagement_weighted_sum",
+    "engagement_weight",
+    "net_focus_minutes",
+    "idle_within_session_minutes",
+    "longest_focus_block_minutes",
+)
+
+
+class DailyActivityAggregate(ActivityBase):
+    __tablename__ = "daily_activity_aggregates"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_daily_activity_aggregates_user_day"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    isolation_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_isolation_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    longest_isolation_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    tracked_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    active_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    deep_work_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    context_switch_count: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    assigned_tasks: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    completed_tasks: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    break_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    late_night_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    weekend_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    engagement_weighted_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    engagement_weight: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    net_focus_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    idle_within_session_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    longest_focus_block_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class ScoringProfile(Base):
+    __tablename__ = "scoring_profiles"
+    __table_args__ = (UniqueConstraint("name", "version", name="uq_scoring_profiles_name_version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    deep_work_target_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    context_switch_target: Mapped[int] = mapped_column(Integer, nullable=False)
+    deep_work_weight: Mapped[float] = mapped_column(Float, nullable=False)
+    engagement_weight: Mapped[float] = mapped_column(Float, nullable=False)
+    task_weight: Mapped[float] = mapped_column(Float, nullable=False)
+    switch_penalty: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class TeamMember(Base):
+    __tablename__ = "team_members"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    team: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    user_id: Mapped[str] = mapped_column(String(128), unique=True, index=True, nullable=False)
+
+
+class TeamScoringProfile(Base):
+    __tablename__ = "team_scoring_profiles"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    team: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("scoring_profiles.id"), nullable=False)
+
+
+class ActivityRollup(ActivityBase):
+    __tablename__ = "activity_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "resolution", "period_start", name="uq_activity_rollups_user_resolution_period"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[str] = mapped_column(String(128), index=True, nullable=False)
+    resolution: Mapped[str] = mapped_column(String(8), nullable=False)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    active_days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tracked_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    deep_work_minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    context_switch_count: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    deep_work_norm: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    engagement_norm: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    task_completion_norm: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    switch_norm: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    isolation_rate: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    productivity_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class PendingRollupDay(ActivityBase):
+    __tablename__ = "pending_rollup_days"
+    __table_args__ = (UniqueConstraint("user_id", "day", name="uq_pending_rollup_days_user_day"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    user_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+
+class CohortDailySketch(Base):
+    __tablename__ = "cohort_daily_sketches"
+    __table_args__ = (
+        UniqueConstraint("cohort", "day", "metric", name="uq_cohort_daily_sketches_cohort_day_metric"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    cohort: Mapped[str] = mapped_column(String(80), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    metric: Mapped[str] = mapped_column(String(32), nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict, defaultdict
+from threading import Lock
+from time import monotonic
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from app.auth import get_current_active_user
+from app.config import settings
+from app.models import User
+from app.schemas import IdleEpisodeBulkCreate, WorkLogBulkCreate
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: int, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = now
+
+    def take(self, now: float, cost: int = 1) -> float:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        required = min(cost, self.capacity)
+        if self.tokens >= required:
+            self.tokens -= cost
+            return 0.0
+        return (required - self.tokens) / self.rate
+
+
+class RateLimiter:
+    def __init__(self, limits: dict[str, tuple[float, int]], max_keys: int) -> None:
+        self.limits = limits
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[tuple[str, str], TokenBucket] = OrderedDict()
+        self._lock = Lock()
+        self.rejected: dict[str, int] = defaultdict(int)
+
+    def check(self, route_class: str, key: str, cost: int = 1) -> None:
+        rate, capacity = self.limits[route_class]
+        if rate <= 0:
+            return
+
+        now = monotonic()
+        with self._lock:
+            bucket = self._buckets.get((route_class, key))
+            if bucket is None:
+                bucket = TokenBucket(rate, capacity, now)
+                self._buckets[(route_class, key)] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end((route_class, key))
+            retry_after = bucket.take(now, cost)
+            if retry_after > 0:
+                self.rejected[route_class] += 1
+
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests.",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+class LoadShedder:
+    def __init__(self, max_in_flight: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.shed = 0
+
+    async def __call__(self, request: Request, call_next):
+        if self.max_in_flight > 0 and self.in_flight >= self.max_in_flight:
+            self.shed += 1
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded."},
+                headers={"Retry-After": "1"},
+            )
+
+        self.in_flight += 1
+        try:
+            return await call_next(request)
+        finally:
+            self.in_flight -= 1
+
+
+rate_limiter = RateLimiter(
+    {
+        "ingestion": (settings.ingestion_rate_per_second, settings.ingestion_burst),
+        "analytics": (settings.analytics_rate_per_second, settings.analytics_burst),
+        "auth": (settings.auth_rate_per_second, settings.auth_burst),
+    },
+    settings.rate_limit_max_keys,
+)
+load_shedder = LoadShedder(settings.max_in_flight_requests)
+
+
+def _rate_limited_user(route_class: str):
+    def dependency(current_user: User = Depends(get_current_active_user)) -> User:
+        rate_limiter.check(route_class, current_user.public_id)
+        return current_user
+
+    return dependency
+
+
+ingestion_user = _rate_limited_user("ingestion")
+analytics_user = _rate_limited_user("analytics")
+
+
+def bulk_idle_episode_user(
+    payload: IdleEpisodeBulkCreate, current_user: User = Depends(get_current_active_user)
+) -> User:
+    rate_limiter.check("ingestion", current_user.public_id, cost=len(payload.items))
+    return current_user
+
+
+def bulk_work_log_user(payload: WorkLogBulkCreate, current_user: User = Depends(get_current_active_user)) -> User:
+    rate_limiter.check("ingestion", current_user.public_id, cost=len(payload.items))
+    return current_user
+
+
+def limit_auth_attempts(request: Request) -> None:
+    client_host = request.client.host if request.client else "unknown"
+    rate_limiter.check("auth", client_host)
+
+
+def get_rate_limit_stats() -> dict[str, object]:
+    return {
+        "rejected": dict(rate_limiter.rejected),
+        "shed": load_shedder.shed,
+        "in_flight": load_shedder.in_flight,
+    }
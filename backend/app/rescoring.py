@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.cohort_sketches import rebuild_cohort_sketches
+from app.config import settings
+from app.core import create_database_tables
+from app.database import SessionLocal, gather_shards
+from app.models import ActivityRollup, ScoringProfile, TeamMember, TeamScoringProfile
+from app.scoring_profiles import get_scoring_profile, to_scoring_parameters
+from app.trend_rollups import PERIOD_RESOLUTIONS, period_start, resum_periods
+from ml.productivity_score import score_day_values
+
+SCORE_INPUT_FIELDS = ("deep_work_minutes", "context_switch_count", "engagement_norm", "task_completion_norm")
+
+
+def profile_user_ids(db: Session, profile: ScoringProfile) -> list[str]:
+    query = (
+        select(TeamMember.user_id)
+        .join(TeamScoringProfile, TeamScoringProfile.team == TeamMember.team)
+        .where(TeamScoringProfile.profile_id == profile.id)
+        .order_by(TeamMember.user_id)
+    )
+    return list(db.scalars(query).all())
+
+
+def rescore_profile(
+    db: Session, profile: ScoringProfile, user_ids: list[str], chunk_size: int | None = None
+) -> set[date]:
+    chunk_size = settings.rescoring_chunk_size if chunk_size is None else chunk_size
+    parameters = to_scoring_parameters(profile)
+    columns = [getattr(ActivityRollup, field) for field in SCORE_INPUT_FIELDS]
+
+    rescored: set[date] = set()
+    for offset in range(0, len(user_ids), chunk_size):
+        query = (
+            select(ActivityRollup.id, ActivityRollup.user_id, ActivityRollup.period_start, *columns)
+            .where(
+                ActivityRollup.resolution == "day",
+                ActivityRollup.user_id.in_(user_ids[offset : offset + chunk_size]),
+            )
+            .order_by(ActivityRollup.id)
+            .limit(chunk_size)
+        )
+        last_id = 0
+        while True:
+            chunk = db.execute(query.where(ActivityRollup.id > last_id)).all()
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+
+            matrix = np.array([row[3:] for row in chunk], dtype=np.float64)
+            scores = score_day_values(
+                {field: matrix[:, index] for index, field in enumerate(SCORE_INPUT_FIELDS)}, parameters
+            )
+            db.execute(
+                update(ActivityRollup),
+                [
+                    {"id": row[0], **{field: float(values[index]) for field, values in scores.items()}}
+                    for index, row in enumerate(chunk)
+                ],
+            )
+            resum_periods(
+                db,
+                {
+                    (row[1], resolution, period_start(row[2], resolution))
+                    for row in chunk
+                    for resolution in PERIOD_RESOLUTIONS
+                },
+            )
+            db.commit()
+            rescored.update(row[2] for row in chunk)
+    return rescored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute stored daily scores for users on teams assigned a scoring profile."
+    )
+    parser.add_argument("--profile", required=True)
+    parser.add_argument("--version", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=settings.rescoring_chunk_size)
+    args = parser.parse_args()
+
+    create_database_tables()
+    db = SessionLocal()
+    try:
+        profile = get_scoring_profile(db, args.profile, args.version)
+        user_ids = profile_user_ids(db, profile)
+        shard_results = gather_shards(
+            lambda shard_db: rescore_profile(shard_db, profile, user_ids, args.chunk_size)
+        )
+        days = set().union(*shard_results)
+        summary = {"profile_id": profile.id, "users": len(user_ids), "rescored_days": len(days)}
+        summary["cohort_sketches"] = rebuild_cohort_sketches(db, days)
+    finally:
+        db.close()
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.cohort_sketches import rebuild_cohort_sketches
+from app.config import settings
+from app.core import create_database_tables
+from app.database import SessionLocal, gather_shards
+from app.models import PendingRollupDay
+from app.services import active_daily_summaries, get_daily_summary
+from app.trend_rollups import write_day_rollups
+
+
+def refresh_pending_rollups(db: Session, batch_size: int) -> set[date]:
+    refreshed: set[date] = set()
+    last_id = 0
+    while True:
+        pending = db.execute(
+            select(PendingRollupDay.id, PendingRollupDay.user_id, PendingRollupDay.day, PendingRollupDay.version)
+            .where(PendingRollupDay.id > last_id)
+            .order_by(PendingRollupDay.id)
+            .limit(batch_size)
+        ).all()
+        if not pending:
+            return refreshed
+        last_id = pending[-1].id
+
+        write_day_rollups(db, [get_daily_summary(db, row.user_id, row.day) for row in pending])
+        for row in pending:
+            db.execute(
+                delete(PendingRollupDay).where(
+                    PendingRollupDay.id == row.id, PendingRollupDay.version == row.version
+                )
+            )
+        db.commit()
+        refreshed.update(row.day for row in pending)
+
+
+def rebuild_rollups(db: Session, days: int, batch_size: int) -> set[date]:
+    window_end = datetime.combine(datetime.now(timezone.utc).date(), time.min)
+    window_start = window_end - timedelta(days=days)
+    rebuilt: set[date] = set()
+    batch: list[dict[str, object]] = []
+    for summary in active_daily_summaries(db, window_start, window_end):
+        batch.append(summary)
+        if len(batch) >= batch_size:
+            write_day_rollups(db, batch)
+            db.commit()
+            rebuilt.update(item["date"] for item in batch)
+            batch = []
+    write_day_rollups(db, batch)
+    db.commit()
+    rebuilt.update(item["date"] for item in batch)
+    return rebuilt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Refresh daily, weekly and monthly trend rollups and cohort sketches for days touched by ingestion."
+        )
+    )
+    parser.add_argument("--rebuild-days", type=int, default=0)
+    args = parser.parse_args()
+
+    create_database_tables()
+    if args.rebuild_days:
+        shard_results = gather_shards(
+            lambda db: rebuild_rollups(db, args.rebuild_days, settings.rollup_batch_size)
+        )
+    else:
+        shard_results = gather_shards(lambda db: refresh_pending_rollups(db, settings.rollup_batch_size))
+    days = set().union(*shard_results)
+
+    db = SessionLocal()
+    try:
+        sketches = rebuild_cohort_sketches(db, days)
+    finally:
+        db.close()
+    print({"rolled_up_days": len(days), "cohort_sketches": sketches})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,108 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.auth import get_current_active_user
-from app.database import get_db
+from app.auth import get_user_db
+from app.ingestion_buffer import flushed_analytics_user, ingestion_buffer
 from app.models import User
+from app.rate_limit import bulk_idle_episode_user, bulk_work_log_user, ingestion_user
 from app.schemas import (
+    ActivityHeatmapResponse,
     AnomalyResponse,
     BurnoutRiskResponse,
+    CohortPercentileResponse,
     DailySummaryResponse,
+    IdleEpisodeBulkCreate,
     IdleEpisodeCreate,
+    IdleEpisodePage,
     IdleEpisodeResponse,
+    IngestionAcceptedResponse,
+    TrendResponse,
+    WorkLogBulkCreate,
     WorkLogCreate,
+    WorkLogPage,
     WorkLogResponse,
 )
 from app.services import (
+    buffer_idle_episodes,
+    buffer_work_logs,
     create_idle_episode,
+    create_idle_episodes,
     create_work_log,
+    create_work_logs,
+    get_activity_heatmap,
     get_anomaly_report,
     get_burnout_report,
+    get_cohort_percentiles,
     get_daily_summary,
+    get_trend_report,
+    stream_idle_episodes,
+    stream_work_logs,
 )
 
 router = APIRouter(prefix="/activity", tags=["Activity"])
+_ACCEPTED_RESPONSES = {202: {"model": IngestionAcceptedResponse}}
 
 
-@router.post("/idle-episodes", response_model=IdleEpisodeResponse)
+def _accepted(accepted: int, sequence: int) -> JSONResponse:
+    content = IngestionAcceptedResponse(accepted=accepted, sequence=sequence)
+    return JSONResponse(status_code=202, content=content.model_dump())
+
+
+@router.post("/idle-episodes", response_model=IdleEpisodeResponse, responses=_ACCEPTED_RESPONSES)
 def create_idle_episode_route(
     payload: IdleEpisodeCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(ingestion_user),
 ):
+    if ingestion_buffer.enabled:
+        return _accepted(1, buffer_idle_episodes(current_user.public_id, [payload]))
     return create_idle_episode(db, current_user.public_id, payload)
 
 
-@router.post("/work-logs", response_model=WorkLogResponse)
+@router.post("/work-logs", response_model=WorkLogResponse, responses=_ACCEPTED_RESPONSES)
 def create_work_log_route(
     payload: WorkLogCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(ingestion_user),
 ):
+    if ingestion_buffer.enabled:
+        return _accepted(1, buffer_work_logs(current_user.public_id, [payload]))
     return create_work_log(db, current_user.public_id, payload)
 
 
+@router.post("/idle-episodes/bulk", response_model=list[IdleEpisodeResponse], responses=_ACCEPTED_RESPONSES)
+def create_idle_episodes_route(
+    payload: IdleEpisodeBulkCreate,
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(bulk_idle_episode_user),
+):
+    if ingestion_buffer.enabled:
+        return _accepted(len(payload.items), buffer_idle_episodes(current_user.public_id, payload.items))
+    return create_idle_episodes(db, current_user.public_id, payload.items)
+
+
+@router.post("/work-logs/bulk", response_model=list[WorkLogResponse], responses=_ACCEPTED_RESPONSES)
+def create_work_logs_route(
+    payload: WorkLogBulkCreate,
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(bulk_work_log_user),
+):
+    if ingestion_buffer.enabled:
+        return _accepted(len(payload.items), buffer_work_logs(current_user.public_id, payload.items))
+    return create_work_logs(db, current_user.public_id, payload.items)
+
+
 @router.get("/me/daily-summary", response_model=DailySummaryResponse)
 def get_daily_summary_route(
     target_date: date = Query(default_factory=date.today),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
 ):
     return get_daily_summary(db, current_user.public_id, target_date)
 
@@ -59,8 +111,8 @@ def get_daily_summary_route(
 def get_burnout_route(
     end_date: date = Query(default_factory=date.today),
     lookback_days: int = Query(default=14, ge=2, le=90),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
 ):
     return get_burnout_report(db, current_user.public_id, end_date, lookback_days)
 
@@ -69,7 +121,70 @@ def get_burnout_route(
 def get_anomaly_route(
     target_date: date = Query(default_factory=date.today),
     lookback_days: int = Query(default=30, ge=3, le=120),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
 ):
     return get_anomaly_report(db, current_user.public_id, target_date, lookback_days)
+
+
+@router.get("/me/percentiles", response_model=CohortPercentileResponse)
+def get_cohort_percentiles_route(
+    target_date: date = Query(default_factory=date.today),
+    cohort: Literal["team", "organisation"] = "organisation",
+    window: Literal["day", "week", "month"] = "day",
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
+):
+    return get_cohort_percentiles(db, current_user.public_id, target_date, cohort, window)
+
+
+@router.get("/me/trends", response_model=TrendResponse)
+def get_trend_route(
+    end_date: date = Query(default_factory=date.today),
+    resolution: Literal["day", "week", "month"] = "week",
+    periods: int = Query(default=52, ge=2, le=366),
+    rolling_window: int = Query(default=4, ge=1, le=52),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
+):
+    return get_trend_report(db, current_user.public_id, end_date, resolution, periods, rolling_window)
+
+
+@router.get("/me/heatmap", response_model=ActivityHeatmapResponse)
+def get_activity_heatmap_route(
+    end_date: date = Query(default_factory=date.today),
+    weeks: int = Query(default=4, ge=1, le=13),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
+):
+    return get_activity_heatmap(db, current_user.public_id, end_date, weeks)
+
+
+@router.get("/me/work-logs", response_class=StreamingResponse, responses={200: {"model": WorkLogPage}})
+def list_work_logs_route(
+    started_from: Optional[datetime] = None,
+    started_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
+):
+    return StreamingResponse(
+        stream_work_logs(db, current_user.public_id, started_from, started_before, cursor, limit),
+        media_type="application/json",
+    )
+
+
+@router.get("/me/idle-episodes", response_class=StreamingResponse, responses={200: {"model": IdleEpisodePage}})
+def list_idle_episodes_route(
+    started_from: Optional[datetime] = None,
+    started_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_user_db),
+    current_user: User = Depends(flushed_analytics_user),
+):
+    return StreamingResponse(
+        stream_idle_episodes(db, current_user.public_id, started_from, started_before, cursor, limit),
+        media_type="application/json",
+    )
@@ -36,6 +36,15 @@ class IdleEpisodeCreate(BaseModel):
     idle_ended_at: datetime
 
 
+class IdleEpisodeBulkCreate(BaseModel):
+    items: list[IdleEpisodeCreate] = Field(min_length=1, max_length=1000)
+
+
+class IngestionAcceptedResponse(BaseModel):
+    accepted: int
+    sequence: int
+
+
 class IdleEpisodeResponse(BaseModel):
     id: int
     user_id: str
@@ -46,6 +55,11 @@ class IdleEpisodeResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class IdleEpisodePage(BaseModel):
+    items: list[IdleEpisodeResponse]
+    next_cursor: Optional[str]
+
+
 class WorkLogCreate(BaseModel):
     session_started_at: datetime
     session_ended_at: datetime
@@ -61,6 +75,10 @@ class WorkLogCreate(BaseModel):
     weekend_minutes: float = Field(default=0, ge=0)
 
 
+class WorkLogBulkCreate(BaseModel):
+    items: list[WorkLogCreate] = Field(min_length=1, max_length=1000)
+
+
 class WorkLogResponse(BaseModel):
     id: int
     user_id: str
@@ -80,6 +98,11 @@ class WorkLogResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class WorkLogPage(BaseModel):
+    items: list[WorkLogResponse]
+    next_cursor: Optional[str]
+
+
 class BurnoutRiskResponse(BaseModel):
     risk_level: str
     risk_score: int
@@ -106,9 +129,106 @@ class DailySummaryResponse(BaseModel):
     tracked_minutes: float
     active_minutes: float
     deep_work_minutes: float
+    context_switch_count: float
     deep_work_norm: float
     engagement_norm: float
     task_completion_norm: float
     switch_norm: float
     productivity_score: float
     breakdown: dict[str, float]
+    scoring_profile: str
+    scoring_profile_version: int
+    net_focus_minutes: float
+    idle_within_session_minutes: float
+    longest_focus_block_minutes: float
+
+
+class MetricPercentile(BaseModel):
+    value: float
+    percentile: Optional[float]
+
+
+class CohortPercentileResponse(BaseModel):
+    user_id: str
+    date: date
+    cohort: str
+    window: str
+    start_date: date
+    end_date: date
+    sample_count: int
+    metrics: dict[str, MetricPercentile]
+    productivity_score_quartiles: list[float]
+
+
+class TrendPoint(BaseModel):
+    period_start: date
+    active_days: int
+    tracked_minutes: Optional[float]
+    deep_work_minutes: Optional[float]
+    engagement_norm: Optional[float]
+    productivity_score: Optional[float]
+    rolling_averages: dict[str, Optional[float]]
+
+
+class TrendResponse(BaseModel):
+    user_id: str
+    resolution: str
+    start_date: date
+    end_date: date
+    rolling_window: int
+    points: list[TrendPoint]
+    slopes: dict[str, float]
+
+
+class ActivityHeatmapResponse(BaseModel):
+    user_id: str
+    start_date: date
+    end_date: date
+    weeks: int
+    tracked_minutes: list[list[float]]
+    active_minutes: list[list[float]]
+    deep_work_minutes: list[list[float]]
+    idle_minutes: list[list[float]]
+
+
+class ScoringProfileCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=64)
+    deep_work_target_minutes: int = Field(gt=0)
+    context_switch_target: int = Field(gt=0)
+    deep_work_weight: float = Field(ge=0, le=1)
+    engagement_weight: float = Field(ge=0, le=1)
+    task_weight: float = Field(ge=0, le=1)
+    switch_penalty: float = Field(ge=0, le=1)
+
+
+class ScoringProfileResponse(BaseModel):
+    id: int
+    name: str
+    version: int
+    deep_work_target_minutes: int
+    context_switch_target: int
+    deep_work_weight: float
+    engagement_weight: float
+    task_weight: float
+    switch_penalty: float
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class TeamScoringProfileAssign(BaseModel):
+    profile_id: int
+
+
+class TeamScoringProfileResponse(BaseModel):
+    team: str
+    profile_id: int
+
+    model_config = {"from_attributes": True}
+
+
+class TeamMemberResponse(BaseModel):
+    team: str
+    user_id: str
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.auth import get_user_by_public_id
+from app.config import settings
+from app.database import get_db
+from app.models import User
+from app.rate_limit import analytics_user
+from app.schemas import (
+    ScoringProfileCreate,
+    ScoringProfileResponse,
+    TeamMemberResponse,
+    TeamScoringProfileAssign,
+    TeamScoringProfileResponse,
+)
+from app.scoring_profiles import (
+    assign_team_member,
+    assign_team_profile,
+    create_scoring_profile,
+    list_scoring_profiles,
+)
+
+router = APIRouter(prefix="/scoring-profiles", tags=["Scoring Profiles"])
+
+
+def admin_user(current_user: User = Depends(analytics_user)) -> User:
+    if current_user.username not in settings.admin_usernames:
+        raise HTTPException(status_code=403, detail="Admin access required.")
+    return current_user
+
+
+@router.post("", response_model=ScoringProfileResponse)
+def create_scoring_profile_route(
+    payload: ScoringProfileCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_user),
+):
+    return create_scoring_profile(db, payload)
+
+
+@router.get("", response_model=list[ScoringProfileResponse])
+def list_scoring_profiles_route(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(analytics_user),
+):
+    return list_scoring_profiles(db)
+
+
+@router.put("/teams/{team}", response_model=TeamScoringProfileResponse)
+def assign_team_profile_route(
+    team: str,
+    payload: TeamScoringProfileAssign,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_user),
+):
+    return assign_team_profile(db, team, payload.profile_id)
+
+
+@router.put("/teams/{team}/members/{user_id}", response_model=TeamMemberResponse)
+def assign_team_member_route(
+    team: str,
+    user_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(admin_user),
+):
+    if get_user_by_public_id(db, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found.")
+    return assign_team_member(db, team, user_id)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import ScoringProfile, TeamMember, TeamScoringProfile
+from app.schemas import ScoringProfileCreate
+from ml.scoring_parameters import DEFAULT_SCORING_PARAMETERS, ScoringParameters
+
+_parameters_cache: dict[str, tuple[float, ScoringParameters]] = {}
+_parameters_cache_lock = Lock()
+
+
+def clear_scoring_cache() -> None:
+    with _parameters_cache_lock:
+        _parameters_cache.clear()
+
+
+def to_scoring_parameters(profile: ScoringProfile) -> ScoringParameters:
+    return ScoringParameters(
+        name=profile.name,
+        version=profile.version,
+        deep_work_target_minutes=profile.deep_work_target_minutes,
+        context_switch_target=profile.context_switch_target,
+        deep_work_weight=profile.deep_work_weight,
+        engagement_weight=profile.engagement_weight,
+        task_weight=profile.task_weight,
+        switch_penalty=profile.switch_penalty,
+    )
+
+
+def create_scoring_profile(db: Session, payload: ScoringProfileCreate) -> ScoringProfile:
+    latest_version = db.scalar(
+        select(func.max(ScoringProfile.version)).where(ScoringProfile.name == payload.name)
+    )
+    profile = ScoringProfile(version=(latest_version or 0) + 1, **payload.model_dump())
+    db.add(profile)
+    db.commit()
+    db.refresh(profile)
+    return profile
+
+
+def list_scoring_profiles(db: Session) -> list[ScoringProfile]:
+    query = select(ScoringProfile).order_by(ScoringProfile.name, ScoringProfile.version)
+    return list(db.scalars(query).all())
+
+
+def get_scoring_profile(db: Session, name: str, version: int | None = None) -> ScoringProfile:
+    query = select(ScoringProfile).where(ScoringProfile.name == name)
+    if version is None:
+        query = query.order_by(ScoringProfile.version.desc()).limit(1)
+    else:
+        query = query.where(ScoringProfile.version == version)
+    profile = db.scalar(query)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Scoring profile not found.")
+    return profile
+
+
+def assign_team_profile(db: Session, team: str, profile_id: int) -> TeamScoringProfile:
+    if db.get(ScoringProfile, profile_id) is None:
+        raise HTTPException(status_code=404, detail="Scoring profile not found.")
+
+    assignment = db.scalar(select(TeamScoringProfile).where(TeamScoringProfile.team == team))
+    if assignment is None:
+        assignment = TeamScoringProfile(team=team, profile_id=profile_id)
+        db.add(assignment)
+    else:
+        assignment.profile_id = profile_id
+    db.commit()
+    db.refresh(assignment)
+    clear_scoring_cache()
+    return assignment
+
+
+def assign_team_member(db: Session, team: str, user_id: str) -> TeamMember:
+    member = db.scalar(select(TeamMember).where(TeamMember.user_id == user_id))
+    if member is None:
+        member = TeamMember(team=team, user_id=user_id)
+        db.add(member)
+    else:
+        member.team = team
+    db.commit()
+    db.refresh(member)
+    clear_scoring_cache()
+    return member
+
+
+def get_scoring_parameters(db: Session, user_id: str) -> ScoringParameters:
+    now = monotonic()
+    with _parameters_cache_lock:
+        cached = _parameters_cache.get(user_id)
+    if cached is not None and now - cached[0] < settings.scoring_profile_cache_seconds:
+        return cached[1]
+
+    query = (
+        select(ScoringProfile)
+        .join(TeamScoringProfile, TeamScoringProfile.profile_id == ScoringProfile.id)
+        .join(TeamMember, TeamMember.team == TeamScoringProfile.team)
+        .where(TeamMember.user_id == user_id)
+    )
+    profile = db.scalar(query)
+    parameters = DEFAULT_SCORING_PARAMETERS if profile is None else to_scoring_parameters(profile)
+
+    with _parameters_cache_lock:
+        _parameters_cache[user_id] = (now, parameters)
+    return parameters
@@ -1,17 +1,47 @@
 from __future__ import annotations
 
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime, time, timedelta, timezone
 
+import numpy as np
 from fastapi import HTTPException
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_, union
 from sqlalchemy.orm import Session
 
+from app.cohort_sketches import (
+    ORGANISATION_COHORT,
+    SKETCH_METRICS,
+    merged_cohort_sketches,
+    team_cohort,
+)
 from app.config import settings
-from app.models import IdleEpisode, WorkLog
-from app.schemas import IdleEpisodeCreate, WorkLogCreate
-from app.utils import clamp, minutes_between, overlap_minutes
-from ml.anomaly_detector import detect_anomaly
-from ml.burnout_detector import detect_burnout
+from app.database import upsert_insert
+from app.feature_store import FeatureWindow, feature_store
+from app.ingestion_buffer import ingestion_buffer
+from app.models import (
+    DAILY_TOTAL_FIELDS,
+    ActivityRollup,
+    DailyActivityAggregate,
+    IdleEpisode,
+    PendingRollupDay,
+    WorkLog,
+)
+from app.schemas import IdleEpisodeCreate, IdleEpisodeResponse, WorkLogCreate, WorkLogResponse
+from app.scoring_profiles import get_scoring_parameters
+from app.trend_rollups import TREND_METRICS, period_start, shift_periods
+from app.utils import (
+    HOURS_PER_WEEK,
+    clamp,
+    hour_of_week_overlaps,
+    minutes_between,
+    overlap_minutes,
+    sweep_focus_intervals,
+)
+from ml.anomaly_detector import ANOMALY_FEATURE_KEYS, detect_anomaly_from_matrix
+from ml.burnout_detector import BURNOUT_FEATURE_KEYS, detect_burnout_from_columns
 from ml.feature_engineering import build_feature_vector
 from ml.productivity_score import calculate_productivity_score
 
@@ -28,12 +58,55 @@ def _day_bounds(target_date: date) -> tuple[datetime, datetime]:
     return day_start, day_end
 
 
-def create_idle_episode(db: Session, user_id: str, payload: IdleEpisodeCreate) -> IdleEpisode:
+_NATURAL_KEYS = {
+    IdleEpisode: ("user_id", "idle_started_at", "idle_ended_at"),
+    WorkLog: ("user_id", "session_started_at", "session_ended_at"),
+}
+
+
+def retention_cutoff() -> datetime:
+    today = datetime.now(timezone.utc).date()
+    return datetime.combine(today - timedelta(days=settings.retention_horizon_days), time.min)
+
+
+def _reject_compacted_range(started_at: datetime) -> None:
+    if started_at < retention_cutoff():
+        raise HTTPException(
+            status_code=422,
+            detail=f"Activity older than {settings.retention_horizon_days} days has already been compacted.",
+        )
+
+
+def _natural_key(values: Iterable[object]) -> tuple[object, ...]:
+    return tuple(_normalize_datetime(value) if isinstance(value, datetime) else value for value in values)
+
+
+def _insert_ignoring_duplicates(
+    db: Session, model: type[IdleEpisode] | type[WorkLog], rows: list[dict[str, object]]
+) -> None:
+    insert = upsert_insert(db, model)
+    statement = insert(model).values(rows).on_conflict_do_nothing(index_elements=list(_NATURAL_KEYS[model]))
+    db.execute(statement)
+
+
+def _fetch_by_natural_keys(
+    db: Session, model: type[IdleEpisode] | type[WorkLog], rows: list[dict[str, object]]
+) -> list[IdleEpisode] | list[WorkLog]:
+    key_names = _NATURAL_KEYS[model]
+    key_columns = [getattr(model, name) for name in key_names]
+    keys = [_natural_key(row[name] for name in key_names) for row in rows]
+    stored = db.scalars(select(model).where(tuple_(*key_columns).in_(set(keys)))).all()
+    by_key = {_natural_key(getattr(item, name) for name in key_names): item for item in stored}
+    return [by_key[key] for key in dict.fromkeys(keys)]
+
+
+def _idle_episode_values(user_id: str, payload: IdleEpisodeCreate) -> dict[str, object]:
     idle_started_at = _normalize_datetime(payload.idle_started_at)
     idle_ended_at = _normalize_datetime(payload.idle_ended_at)
 
     if idle_ended_at <= idle_started_at:
         raise HTTPException(status_code=400, detail="idle_ended_at must be after idle_started_at.")
+    _reject_compacted_range(idle_started_at)
 
     idle_minutes = minutes_between(idle_started_at, idle_ended_at)
     if idle_minutes < settings.idle_threshold_minutes:
@@ -42,52 +115,127 @@ def create_idle_episode(db: Session, user_id: str, payload: IdleEpisodeCreate) -
             detail=f"Idle episode must be at least {settings.idle_threshold_minutes} minutes.",
         )
 
-    episode = IdleEpisode(
-        user_id=user_id,
-        idle_started_at=idle_started_at,
-        idle_ended_at=idle_ended_at,
-        idle_minutes=round(idle_minutes, 2),
-    )
-    db.add(episode)
-    db.commit()
-    db.refresh(episode)
-    return episode
+    return {
+        "user_id": user_id,
+        "idle_started_at": idle_started_at,
+        "idle_ended_at": idle_ended_at,
+        "idle_minutes": round(idle_minutes, 2),
+    }
 
 
-def create_work_log(db: Session, user_id: str, payload: WorkLogCreate) -> WorkLog:
+def _work_log_values(user_id: str, payload: WorkLogCreate) -> dict[str, object]:
     session_started_at = _normalize_datetime(payload.session_started_at)
     session_ended_at = _normalize_datetime(payload.session_ended_at)
 
     if session_ended_at <= session_started_at:
         raise HTTPException(status_code=400, detail="session_ended_at must be after session_started_at.")
+    _reject_compacted_range(session_started_at)
 
     inferred_tracked = minutes_between(session_started_at, session_ended_at)
     tracked_minutes = inferred_tracked if payload.tracked_minutes is None else payload.tracked_minutes
     if tracked_minutes <= 0:
         raise HTTPException(status_code=422, detail="tracked_minutes must be greater than 0.")
 
-    work_log = WorkLog(
-        user_id=user_id,
-        session_started_at=session_started_at,
-        session_ended_at=session_ended_at,
-        tracked_minutes=round(tracked_minutes, 2),
-        active_minutes=round(clamp(payload.active_minutes, 0.0, tracked_minutes), 2),
-        deep_work_minutes=round(clamp(payload.deep_work_minutes, 0.0, tracked_minutes), 2),
-        engagement_score=payload.engagement_score,
-        context_switch_count=payload.context_switch_count,
-        assigned_tasks=payload.assigned_tasks,
-        completed_tasks=payload.completed_tasks,
-        break_minutes=round(clamp(payload.break_minutes, 0.0, tracked_minutes), 2),
-        late_night_minutes=round(max(payload.late_night_minutes, 0.0), 2),
-        weekend_minutes=round(max(payload.weekend_minutes, 0.0), 2),
+    return {
+        "user_id": user_id,
+        "session_started_at": session_started_at,
+        "session_ended_at": session_ended_at,
+        "tracked_minutes": round(tracked_minutes, 2),
+        "active_minutes": round(clamp(payload.active_minutes, 0.0, tracked_minutes), 2),
+        "deep_work_minutes": round(clamp(payload.deep_work_minutes, 0.0, tracked_minutes), 2),
+        "engagement_score": payload.engagement_score,
+        "context_switch_count": payload.context_switch_count,
+        "assigned_tasks": payload.assigned_tasks,
+        "completed_tasks": payload.completed_tasks,
+        "break_minutes": round(clamp(payload.break_minutes, 0.0, tracked_minutes), 2),
+        "late_night_minutes": round(max(payload.late_night_minutes, 0.0), 2),
+        "weekend_minutes": round(max(payload.weekend_minutes, 0.0), 2),
+    }
+
+
+def _touched_days(started_at: datetime, ended_at: datetime) -> Iterator[date]:
+    day = started_at.date()
+    while datetime.combine(day, time.min) < ended_at:
+        yield day
+        day += timedelta(days=1)
+
+
+def _touched_user_days(
+    model: type[IdleEpisode] | type[WorkLog], rows: list[dict[str, object]]
+) -> dict[str, set[date]]:
+    _, started_field, ended_field = _NATURAL_KEYS[model]
+    touched: dict[str, set[date]] = {}
+    for row in rows:
+        touched.setdefault(row["user_id"], set()).update(_touched_days(row[started_field], row[ended_field]))
+    return touched
+
+
+def _mark_pending_rollups(db: Session, touched: dict[str, set[date]]) -> None:
+    insert = upsert_insert(db, PendingRollupDay)
+    statement = insert(PendingRollupDay).values(
+        [{"user_id": user_id, "day": day, "version": 1} for user_id, days in touched.items() for day in sorted(days)]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "day"],
+        set_={"version": PendingRollupDay.version + 1},
     )
-    db.add(work_log)
+    db.execute(statement)
+
+
+def _store_activity_rows(
+    db: Session, model: type[IdleEpisode] | type[WorkLog], rows: list[dict[str, object]]
+) -> None:
+    touched = _touched_user_days(model, rows)
+    _insert_ignoring_duplicates(db, model, rows)
+    _mark_pending_rollups(db, touched)
     db.commit()
-    db.refresh(work_log)
-    return work_log
+    for user_id, days in touched.items():
+        feature_store.invalidate(user_id, days)
 
 
-def _aggregate_idle_metrics(db: Session, user_id: str, day_start: datetime, day_end: datetime) -> dict[str, float]:
+def create_idle_episodes(db: Session, user_id: str, payloads: list[IdleEpisodeCreate]) -> list[IdleEpisode]:
+    rows = [_idle_episode_values(user_id, payload) for payload in payloads]
+    _store_activity_rows(db, IdleEpisode, rows)
+    return _fetch_by_natural_keys(db, IdleEpisode, rows)
+
+
+def create_work_logs(db: Session, user_id: str, payloads: list[WorkLogCreate]) -> list[WorkLog]:
+    rows = [_work_log_values(user_id, payload) for payload in payloads]
+    _store_activity_rows(db, WorkLog, rows)
+    return _fetch_by_natural_keys(db, WorkLog, rows)
+
+
+def create_idle_episode(db: Session, user_id: str, payload: IdleEpisodeCreate) -> IdleEpisode:
+    return create_idle_episodes(db, user_id, [payload])[0]
+
+
+def create_work_log(db: Session, user_id: str, payload: WorkLogCreate) -> WorkLog:
+    return create_work_logs(db, user_id, [payload])[0]
+
+
+_BUFFERED_MODELS = {model.__tablename__: model for model in _NATURAL_KEYS}
+
+
+def buffer_idle_episodes(user_id: str, payloads: list[IdleEpisodeCreate]) -> int:
+    rows = [_idle_episode_values(user_id, payload) for payload in payloads]
+    return ingestion_buffer.append(IdleEpisode.__tablename__, rows)
+
+
+def buffer_work_logs(user_id: str, payloads: list[WorkLogCreate]) -> int:
+    rows = [_work_log_values(user_id, payload) for payload in payloads]
+    return ingestion_buffer.append(WorkLog.__tablename__, rows)
+
+
+def apply_buffered_rows(db: Session, table: str, rows: list[dict[str, object]]) -> None:
+    model = _BUFFERED_MODELS[table]
+    _, started_field, ended_field = _NATURAL_KEYS[model]
+    for row in rows:
+        row[started_field] = datetime.fromisoformat(row[started_field])
+        row[ended_field] = datetime.fromisoformat(row[ended_field])
+    _store_activity_rows(db, model, rows)
+
+
+def _idle_totals(db: Session, user_id: str, day_start: datetime, day_end: datetime) -> dict[str, float]:
     query = select(IdleEpisode).where(
         IdleEpisode.user_id == user_id,
         IdleEpisode.idle_started_at < day_end,
@@ -103,20 +251,27 @@ def _aggregate_idle_metrics(db: Session, user_id: str, day_start: datetime, day_
         if overlap > 0:
             overlaps.append(overlap)
 
-    total_isolation_minutes = sum(overlaps)
-    isolation_count = len(overlaps)
+    return {
+        "isolation_count": len(overlaps),
+        "total_isolation_minutes": sum(overlaps),
+        "longest_isolation_minutes": max(overlaps) if overlaps else 0.0,
+    }
+
+
+def _idle_metrics_from_totals(totals: dict[str, float]) -> dict[str, float]:
+    isolation_count = int(totals["isolation_count"])
+    total_isolation_minutes = totals["total_isolation_minutes"]
     avg_isolation_duration = total_isolation_minutes / isolation_count if isolation_count else 0.0
-    longest_isolation = max(overlaps) if overlaps else 0.0
 
     return {
         "isolation_count": isolation_count,
         "total_isolation_minutes": round(total_isolation_minutes, 2),
         "avg_isolation_duration_minutes": round(avg_isolation_duration, 2),
-        "longest_isolation_minutes": round(longest_isolation, 2),
+        "longest_isolation_minutes": round(totals["longest_isolation_minutes"], 2),
     }
 
 
-def _aggregate_work_metrics(db: Session, user_id: str, day_start: datetime, day_end: datetime) -> dict[str, float]:
+def _work_totals(db: Session, user_id: str, day_start: datetime, day_end: datetime) -> dict[str, float]:
     query = select(WorkLog).where(
         WorkLog.user_id == user_id,
         WorkLog.session_started_at < day_end,
@@ -162,34 +317,197 @@ def _aggregate_work_metrics(db: Session, user_id: str, day_start: datetime, day_
             engagement_weighted_sum += log.engagement_score * overlap
             engagement_weight += overlap
 
+    return {
+        "tracked_minutes": tracked_minutes,
+        "active_minutes": active_minutes,
+        "deep_work_minutes": deep_work_minutes,
+        "context_switch_count": context_switch_count,
+        "assigned_tasks": assigned_tasks,
+        "completed_tasks": completed_tasks,
+        "break_minutes": break_minutes,
+        "late_night_minutes": late_night_minutes,
+        "weekend_minutes": weekend_minutes,
+        "engagement_weighted_sum": engagement_weighted_sum,
+        "engagement_weight": engagement_weight,
+    }
+
+
+def _work_metrics_from_totals(totals: dict[str, float]) -> dict[str, float]:
     engagement_score = None
-    if engagement_weight > 0:
-        engagement_score = engagement_weighted_sum / engagement_weight
+    if totals["engagement_weight"] > 0:
+        engagement_score = totals["engagement_weighted_sum"] / totals["engagement_weight"]
 
     return {
-        "tracked_minutes": round(tracked_minutes, 2),
-        "active_minutes": round(active_minutes, 2),
-        "deep_work_minutes": round(deep_work_minutes, 2),
-        "context_switch_count": round(context_switch_count, 2),
-        "assigned_tasks": round(assigned_tasks, 2),
-        "completed_tasks": round(completed_tasks, 2),
-        "break_minutes": round(break_minutes, 2),
-        "late_night_minutes": round(late_night_minutes, 2),
-        "weekend_minutes": round(weekend_minutes, 2),
+        "tracked_minutes": round(totals["tracked_minutes"], 2),
+        "active_minutes": round(totals["active_minutes"], 2),
+        "deep_work_minutes": round(totals["deep_work_minutes"], 2),
+        "context_switch_count": round(totals["context_switch_count"], 2),
+        "assigned_tasks": round(totals["assigned_tasks"], 2),
+        "completed_tasks": round(totals["completed_tasks"], 2),
+        "break_minutes": round(totals["break_minutes"], 2),
+        "late_night_minutes": round(totals["late_night_minutes"], 2),
+        "weekend_minutes": round(totals["weekend_minutes"], 2),
         "engagement_score": None if engagement_score is None else round(engagement_score, 4),
     }
 
 
-def get_daily_summary(db: Session, user_id: str, target_date: date) -> dict[str, object]:
+def _encode_cursor(started_at: datetime, row_id: int) -> str:
+    return urlsafe_b64encode(f"{started_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        started_at, row_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(started_at), int(row_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from exc
+
+
+def _keyset_page_query(
+    model: type[IdleEpisode] | type[WorkLog],
+    started_column,
+    user_id: str,
+    started_from: datetime | None,
+    started_before: datetime | None,
+    cursor: str | None,
+    limit: int,
+):
+    query = select(model).where(model.user_id == user_id)
+    if started_from is not None:
+        query = query.where(started_column >= _normalize_datetime(started_from))
+    if started_before is not None:
+        query = query.where(started_column < _normalize_datetime(started_before))
+    if cursor is not None:
+        query = query.where(tuple_(started_column, model.id) > _decode_cursor(cursor))
+    return query.order_by(started_column, model.id).limit(limit + 1)
+
+
+def _stream_page(
+    db: Session, query, started_key: str, response_schema: type[BaseModel], limit: int
+) -> Iterator[str]:
+    yield '{"items":['
+    last_item = None
+    next_cursor = None
+    for index, item in enumerate(db.scalars(query.execution_options(yield_per=200))):
+        if index == limit:
+            next_cursor = _encode_cursor(getattr(last_item, started_key), last_item.id)
+            break
+        yield ("," if index else "") + response_schema.model_validate(item).model_dump_json()
+        last_item = item
+    yield '],"next_cursor":' + json.dumps(next_cursor) + "}"
+
+
+def stream_work_logs(
+    db: Session,
+    user_id: str,
+    started_from: datetime | None,
+    started_before: datetime | None,
+    cursor: str | None,
+    limit: int,
+) -> Iterator[str]:
+    query = _keyset_page_query(
+        WorkLog, WorkLog.session_started_at, user_id, started_from, started_before, cursor, limit
+    )
+    return _stream_page(db, query, "session_started_at", WorkLogResponse, limit)
+
+
+def stream_idle_episodes(
+    db: Session,
+    user_id: str,
+    started_from: datetime | None,
+    started_before: datetime | None,
+    cursor: str | None,
+    limit: int,
+) -> Iterator[str]:
+    query = _keyset_page_query(
+        IdleEpisode, IdleEpisode.idle_started_at, user_id, started_from, started_before, cursor, limit
+    )
+    return _stream_page(db, query, "idle_started_at", IdleEpisodeResponse, limit)
+
+
+def _aggregate_focus_metrics(db: Session, user_id: str, day_start: datetime, day_end: datetime) -> dict[str, float]:
+    work_intervals = db.execute(
+        select(WorkLog.session_started_at, WorkLog.session_ended_at).where(
+            WorkLog.user_id == user_id,
+            WorkLog.session_started_at < day_end,
+            WorkLog.session_ended_at > day_start,
+        )
+    ).all()
+    idle_intervals = db.execute(
+        select(IdleEpisode.idle_started_at, IdleEpisode.idle_ended_at).where(
+            IdleEpisode.user_id == user_id,
+            IdleEpisode.idle_started_at < day_end,
+            IdleEpisode.idle_ended_at > day_start,
+        )
+    ).all()
+    return sweep_focus_intervals(
+        [tuple(row) for row in work_intervals],
+        [tuple(row) for row in idle_intervals],
+        day_start,
+        day_end,
+    )
+
+
+def compute_raw_day_totals(db: Session, user_id: str, target_date: date) -> dict[str, float]:
     day_start, day_end = _day_bounds(target_date)
-    idle_metrics = _aggregate_idle_metrics(db, user_id, day_start, day_end)
-    work_metrics = _aggregate_work_metrics(db, user_id, day_start, day_end)
+    return {
+        **_idle_totals(db, user_id, day_start, day_end),
+        **_work_totals(db, user_id, day_start, day_end),
+        **_aggregate_focus_metrics(db, user_id, day_start, day_end),
+    }
 
+
+def activity_days(
+    db: Session, user_id: str, window_start: datetime | None, window_end: datetime
+) -> set[date]:
+    work_query = select(WorkLog.session_started_at, WorkLog.session_ended_at).where(
+        WorkLog.user_id == user_id,
+        WorkLog.session_started_at < window_end,
+    )
+    idle_query = select(IdleEpisode.idle_started_at, IdleEpisode.idle_ended_at).where(
+        IdleEpisode.user_id == user_id,
+        IdleEpisode.idle_started_at < window_end,
+    )
+    if window_start is not None:
+        work_query = work_query.where(WorkLog.session_ended_at > window_start)
+        idle_query = idle_query.where(IdleEpisode.idle_ended_at > window_start)
+    intervals = db.execute(work_query).all() + db.execute(idle_query).all()
+
+    days: set[date] = set()
+    for started_at, ended_at in intervals:
+        if window_start is not None:
+            started_at = max(started_at, window_start)
+        last_moment = min(ended_at, window_end)
+        day = started_at.date()
+        while datetime.combine(day, time.min) < last_moment:
+            days.add(day)
+            day += timedelta(days=1)
+    return days
+
+
+def _day_totals(db: Session, user_id: str, target_date: date) -> dict[str, float]:
+    compacted = db.scalar(
+        select(DailyActivityAggregate).where(
+            DailyActivityAggregate.user_id == user_id,
+            DailyActivityAggregate.day == target_date,
+        )
+    )
+    if compacted is None:
+        return compute_raw_day_totals(db, user_id, target_date)
+    return {field: getattr(compacted, field) for field in DAILY_TOTAL_FIELDS}
+
+
+def get_daily_summary(db: Session, user_id: str, target_date: date) -> dict[str, object]:
+    totals = _day_totals(db, user_id, target_date)
+    idle_metrics = _idle_metrics_from_totals(totals)
+    work_metrics = _work_metrics_from_totals(totals)
+
+    scoring_parameters = get_scoring_parameters(db, user_id)
     aggregates = {**idle_metrics, **work_metrics}
-    features = build_feature_vector(aggregates)
-    productivity_score, score_breakdown = calculate_productivity_score(features)
+    features = build_feature_vector(aggregates, scoring_parameters)
+    productivity_score, score_breakdown = calculate_productivity_score(features, scoring_parameters)
 
-    return {
+    summary = {
         "user_id": user_id,
         "date": target_date,
         "isolation_count": idle_metrics["isolation_count"],
@@ -200,16 +518,48 @@ def get_daily_summary(db: Session, user_id: str, target_date: date) -> dict[str,
         "tracked_minutes": features["tracked_minutes"],
         "active_minutes": features["active_minutes"],
         "deep_work_minutes": features["deep_work_minutes"],
+        "context_switch_count": work_metrics["context_switch_count"],
         "deep_work_norm": features["deep_work_norm"],
         "engagement_norm": features["engagement_norm"],
         "task_completion_norm": features["task_completion_norm"],
         "switch_norm": features["switch_norm"],
         "productivity_score": productivity_score,
         "breakdown": score_breakdown,
+        "scoring_profile": scoring_parameters.name,
+        "scoring_profile_version": scoring_parameters.version,
         "break_minutes": work_metrics["break_minutes"],
         "late_night_minutes": work_metrics["late_night_minutes"],
         "weekend_minutes": work_metrics["weekend_minutes"],
+        "net_focus_minutes": round(totals["net_focus_minutes"], 2),
+        "idle_within_session_minutes": round(totals["idle_within_session_minutes"], 2),
+        "longest_focus_block_minutes": round(totals["longest_focus_block_minutes"], 2),
     }
+    return summary
+
+
+def active_daily_summaries(
+    db: Session, window_start: datetime, window_end: datetime
+) -> Iterator[dict[str, object]]:
+    user_ids = db.scalars(
+        union(
+            select(WorkLog.user_id).where(WorkLog.session_started_at >= window_start),
+            select(DailyActivityAggregate.user_id).where(DailyActivityAggregate.day >= window_start.date()),
+        ),
+        bind_arguments={"mapper": WorkLog},
+    ).all()
+
+    for user_id in user_ids:
+        compacted_days = db.scalars(
+            select(DailyActivityAggregate.day).where(
+                DailyActivityAggregate.user_id == user_id,
+                DailyActivityAggregate.day >= window_start.date(),
+            )
+        ).all()
+        days = set(compacted_days) | activity_days(db, user_id, window_start, window_end)
+        for day in sorted(days):
+            summary = get_daily_summary(db, user_id, day)
+            if float(summary["tracked_minutes"]) > 0:
+                yield summary
 
 
 def _date_range(end_date: date, lookback_days: int) -> list[date]:
@@ -217,31 +567,231 @@ def _date_range(end_date: date, lookback_days: int) -> list[date]:
     return [start_date + timedelta(days=i) for i in range(lookback_days)]
 
 
+def _feature_window(db: Session, user_id: str, end_date: date, lookback_days: int) -> FeatureWindow:
+    return feature_store.window(
+        user_id,
+        get_scoring_parameters(db, user_id),
+        _date_range(end_date, lookback_days),
+        lambda day: get_daily_summary(db, user_id, day),
+    )
+
+
 def get_burnout_report(db: Session, user_id: str, end_date: date, lookback_days: int) -> dict[str, object]:
     if lookback_days < 2:
         raise HTTPException(status_code=422, detail="lookback_days must be at least 2.")
 
-    history = [get_daily_summary(db, user_id, day) for day in _date_range(end_date, lookback_days)]
-    return detect_burnout(history, lookback_days)
+    window = _feature_window(db, user_id, end_date, lookback_days)
+    return detect_burnout_from_columns(window.columns(BURNOUT_FEATURE_KEYS), lookback_days)
 
 
 def get_anomaly_report(db: Session, user_id: str, target_date: date, lookback_days: int) -> dict[str, object]:
     if lookback_days < 3:
         raise HTTPException(status_code=422, detail="lookback_days must be at least 3.")
 
-    history = [get_daily_summary(db, user_id, day) for day in _date_range(target_date, lookback_days)]
+    window = _feature_window(db, user_id, target_date, lookback_days)
+    return detect_anomaly_from_matrix(
+        window.matrix(ANOMALY_FEATURE_KEYS), window.column("productivity_score"), lookback_days
+    )
+
+
+PERCENTILE_WINDOW_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+def get_cohort_percentiles(
+    db: Session, user_id: str, target_date: date, cohort: str, window: str
+) -> dict[str, object]:
+    if cohort == "team":
+        cohort_name = team_cohort(db, user_id)
+        if cohort_name is None:
+            raise HTTPException(status_code=404, detail="User is not assigned to a team.")
+    else:
+        cohort_name = ORGANISATION_COHORT
+
+    summary = get_daily_summary(db, user_id, target_date)
+    start_date = target_date - timedelta(days=PERCENTILE_WINDOW_DAYS[window] - 1)
+    sketches = merged_cohort_sketches(db, cohort_name, start_date, target_date)
+
+    metrics = {}
+    for metric in SKETCH_METRICS:
+        rank = sketches[metric].rank(float(summary[metric]))
+        metrics[metric] = {
+            "value": summary[metric],
+            "percentile": None if rank is None else round(rank * 100, 1),
+        }
+
+    score_sketch = sketches["productivity_score"]
+    quartiles = [score_sketch.quantile(fraction) for fraction in (0.25, 0.5, 0.75)] if score_sketch.count else []
+    return {
+        "user_id": user_id,
+        "date": target_date,
+        "cohort": cohort_name,
+        "window": window,
+        "start_date": start_date,
+        "end_date": target_date,
+        "sample_count": score_sketch.count,
+        "metrics": metrics,
+        "productivity_score_quartiles": quartiles,
+    }
+
+
+TREND_PERIOD_LIMITS = {"day": 366, "week": 156, "month": 60}
+_TREND_DECIMALS = {"tracked_minutes": 2, "deep_work_minutes": 2, "engagement_norm": 4, "productivity_score": 2}
 
-    feature_history: list[dict[str, float]] = []
-    for day in history:
-        feature_history.append(
+
+def _optional_round(value: float, decimals: int) -> float | None:
+    return None if np.isnan(value) else round(float(value), decimals)
+
+
+def _trend_slope(positions: np.ndarray, values: np.ndarray) -> float:
+    if len(positions) < 2:
+        return 0.0
+    x_offsets = positions - positions.mean()
+    denominator = float(np.sum(x_offsets**2))
+    if denominator == 0:
+        return 0.0
+    return float(np.sum(x_offsets * (values - values.mean()))) / denominator
+
+
+def get_trend_report(
+    db: Session, user_id: str, end_date: date, resolution: str, periods: int, rolling_window: int
+) -> dict[str, object]:
+    if periods > TREND_PERIOD_LIMITS[resolution]:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {TREND_PERIOD_LIMITS[resolution]} periods are available at {resolution} resolution.",
+        )
+
+    last_start = period_start(end_date, resolution)
+    first_start = shift_periods(last_start, resolution, -(periods - 1))
+    starts = [shift_periods(first_start, resolution, index) for index in range(periods)]
+    positions = {start: index for index, start in enumerate(starts)}
+
+    rows = db.execute(
+        select(
+            ActivityRollup.period_start,
+            ActivityRollup.active_days,
+            *(getattr(ActivityRollup, metric) for metric in TREND_METRICS),
+        ).where(
+            ActivityRollup.user_id == user_id,
+            ActivityRollup.resolution == resolution,
+            ActivityRollup.period_start >= first_start,
+            ActivityRollup.period_start <= last_start,
+        )
+    ).all()
+
+    active_days = np.zeros(periods, dtype=np.float64)
+    sums = np.zeros((periods, len(TREND_METRICS)), dtype=np.float64)
+    for row in rows:
+        active_days[positions[row[0]]] = row[1]
+        sums[positions[row[0]]] = row[2:]
+
+    window_starts = np.maximum(np.arange(periods) - rolling_window + 1, 0)
+    cumulative_sums = np.vstack([np.zeros(len(TREND_METRICS)), np.cumsum(sums, axis=0)])
+    cumulative_days = np.concatenate([[0.0], np.cumsum(active_days)])
+    window_sums = cumulative_sums[1:] - cumulative_sums[window_starts]
+    window_days = cumulative_days[1:] - cumulative_days[window_starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        averages = sums / active_days[:, None]
+        rolling = window_sums / window_days[:, None]
+
+    active = active_days > 0
+    active_positions = np.flatnonzero(active).astype(np.float64)
+    slopes = {
+        metric: round(_trend_slope(active_positions, averages[active, index]), 4)
+        for index, metric in enumerate(TREND_METRICS)
+    }
+
+    points = []
+    for index, start in enumerate(starts):
+        points.append(
             {
-                "deep_work_norm": float(day["deep_work_norm"]),
-                "engagement_norm": float(day["engagement_norm"]),
-                "task_completion_norm": float(day["task_completion_norm"]),
-                "switch_norm": float(day["switch_norm"]),
-                "isolation_rate": float(day["isolation_rate"]),
-                "productivity_score": float(day["productivity_score"]),
+                "period_start": start,
+                "active_days": int(active_days[index]),
+                **{
+                    metric: _optional_round(averages[index, column], _TREND_DECIMALS[metric])
+                    for column, metric in enumerate(TREND_METRICS)
+                },
+                "rolling_averages": {
+                    metric: _optional_round(rolling[index, column], _TREND_DECIMALS[metric])
+                    for column, metric in enumerate(TREND_METRICS)
+                },
             }
         )
 
-    return detect_anomaly(feature_history, lookback_days)
+    return {
+        "user_id": user_id,
+        "resolution": resolution,
+        "start_date": first_start,
+        "end_date": shift_periods(last_start, resolution, 1) - timedelta(days=1),
+        "rolling_window": rolling_window,
+        "points": points,
+        "slopes": slopes,
+    }
+
+
+def _minutes_since(origin: datetime, values: list[datetime]) -> np.ndarray:
+    stamps = np.array([_normalize_datetime(value) for value in values], dtype="datetime64[us]")
+    return (stamps - np.datetime64(origin, "us")) / np.timedelta64(1, "m")
+
+
+def _hour_of_week_grid(cell: np.ndarray, weights: np.ndarray) -> list[list[float]]:
+    totals = np.bincount(cell, weights=weights, minlength=HOURS_PER_WEEK)
+    return np.round(totals, 2).reshape(7, 24).tolist()
+
+
+def get_activity_heatmap(db: Session, user_id: str, end_date: date, weeks: int) -> dict[str, object]:
+    if weeks < 1:
+        raise HTTPException(status_code=422, detail="weeks must be at least 1.")
+
+    start_date = end_date - timedelta(days=weeks * 7 - 1)
+    range_start, _ = _day_bounds(start_date)
+    _, range_end = _day_bounds(end_date)
+    range_minutes = minutes_between(range_start, range_end)
+    origin_weekday = start_date.weekday()
+
+    work_rows = db.execute(
+        select(
+            WorkLog.session_started_at,
+            WorkLog.session_ended_at,
+            WorkLog.active_minutes,
+            WorkLog.deep_work_minutes,
+        ).where(
+            WorkLog.user_id == user_id,
+            WorkLog.session_started_at < range_end,
+            WorkLog.session_ended_at > range_start,
+        )
+    ).all()
+    idle_rows = db.execute(
+        select(IdleEpisode.idle_started_at, IdleEpisode.idle_ended_at).where(
+            IdleEpisode.user_id == user_id,
+            IdleEpisode.idle_started_at < range_end,
+            IdleEpisode.idle_ended_at > range_start,
+        )
+    ).all()
+
+    work_starts = _minutes_since(range_start, [row.session_started_at for row in work_rows])
+    work_ends = _minutes_since(range_start, [row.session_ended_at for row in work_rows])
+    active = np.array([row.active_minutes for row in work_rows], dtype=np.float64)
+    deep_work = np.array([row.deep_work_minutes for row in work_rows], dtype=np.float64)
+
+    owner, work_cell, work_overlap = hour_of_week_overlaps(
+        work_starts, work_ends, range_minutes, origin_weekday
+    )
+    ratio = work_overlap / (work_ends - work_starts)[owner]
+
+    idle_starts = _minutes_since(range_start, [row.idle_started_at for row in idle_rows])
+    idle_ends = _minutes_since(range_start, [row.idle_ended_at for row in idle_rows])
+    _, idle_cell, idle_overlap = hour_of_week_overlaps(
+        idle_starts, idle_ends, range_minutes, origin_weekday
+    )
+
+    return {
+        "user_id": user_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "weeks": weeks,
+        "tracked_minutes": _hour_of_week_grid(work_cell, work_overlap),
+        "active_minutes": _hour_of_week_grid(work_cell, active[owner] * ratio),
+        "deep_work_minutes": _hour_of_week_grid(work_cell, deep_work[owner] * ratio),
+        "idle_minutes": _hour_of_week_grid(idle_cell, idle_overlap),
+    }
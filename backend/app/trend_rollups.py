@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import ActivityRollup
+
+TREND_METRICS = ("tracked_minutes", "deep_work_minutes", "engagement_norm", "productivity_score")
+ROLLUP_FIELDS = (
+    "tracked_minutes",
+    "deep_work_minutes",
+    "context_switch_count",
+    "deep_work_norm",
+    "engagement_norm",
+    "task_completion_norm",
+    "switch_norm",
+    "isolation_rate",
+    "productivity_score",
+)
+PERIOD_RESOLUTIONS = ("week", "month")
+
+
+def period_start(day: date, resolution: str) -> date:
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    return day
+
+
+def shift_periods(start: date, resolution: str, count: int) -> date:
+    if resolution == "week":
+        return start + timedelta(weeks=count)
+    if resolution == "month":
+        month_index = start.year * 12 + start.month - 1 + count
+        return date(month_index // 12, month_index % 12 + 1, 1)
+    return start + timedelta(days=count)
+
+
+def _upsert_rollups(db: Session, rows: list[dict[str, object]]) -> None:
+    if not rows:
+        return
+    insert = upsert_insert(db, ActivityRollup)
+    statement = insert(ActivityRollup).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "resolution", "period_start"],
+        set_={field: statement.excluded[field] for field in ("active_days", *ROLLUP_FIELDS)},
+    )
+    db.execute(statement)
+
+
+def resum_periods(db: Session, periods: set[tuple[str, str, date]]) -> None:
+    sums = [func.coalesce(func.sum(getattr(ActivityRollup, field)), 0.0) for field in ROLLUP_FIELDS]
+    rows = []
+    for user_id, resolution, start in sorted(periods):
+        totals = db.execute(
+            select(func.count(ActivityRollup.id), *sums).where(
+                ActivityRollup.user_id == user_id,
+                ActivityRollup.resolution == "day",
+                ActivityRollup.period_start >= start,
+                ActivityRollup.period_start < shift_periods(start, resolution, 1),
+            )
+        ).one()
+        rows.append(
+            {
+                "user_id": user_id,
+                "resolution": resolution,
+                "period_start": start,
+                "active_days": totals[0],
+                **dict(zip(ROLLUP_FIELDS, totals[1:])),
+            }
+        )
+    _upsert_rollups(db, rows)
+
+
+def write_day_rollups(db: Session, summaries: list[dict[str, object]]) -> None:
+    day_rows = []
+    periods: set[tuple[str, str, date]] = set()
+    for summary in summaries:
+        user_id, day = summary["user_id"], summary["date"]
+        if summary["tracked_minutes"] > 0:
+            day_rows.append(
+                {
+                    "user_id": user_id,
+                    "resolution": "day",
+                    "period_start": day,
+                    "active_days": 1,
+                    **{field: float(summary[field]) for field in ROLLUP_FIELDS},
+                }
+            )
+        else:
+            db.execute(
+                delete(ActivityRollup).where(
+                    ActivityRollup.user_id == user_id,
+                    ActivityRollup.resolution == "day",
+                    ActivityRollup.period_start == day,
+                )
+            )
+        periods.update((user_id, resolution, period_start(day, resolution)) for resolution in PERIOD_RESOLUTIONS)
+
+    _upsert_rollups(db, day_rows)
+    resum_periods(db, periods)
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 
+import numpy as np
+
+HOURS_PER_WEEK = 7 * 24
+
 
 def clamp(value: float, minimum: float = 0.0, maximum: float = 1.0) -> float:
     return max(minimum, min(value, maximum))
@@ -29,3 +33,97 @@ def overlap_minutes(
     if end <= start:
         return 0.0
     return minutes_between(start, end)
+
+
+def _clipped_events(
+    intervals: list[tuple[datetime, datetime]],
+    window_start: datetime,
+    window_end: datetime,
+    work_delta: int,
+    idle_delta: int,
+) -> list[tuple[datetime, int, int]]:
+    events: list[tuple[datetime, int, int]] = []
+    for start, end in intervals:
+        start = max(start, window_start)
+        end = min(end, window_end)
+        if end > start:
+            events.append((start, work_delta, idle_delta))
+            events.append((end, -work_delta, -idle_delta))
+    return events
+
+
+def sweep_focus_intervals(
+    work_intervals: list[tuple[datetime, datetime]],
+    idle_intervals: list[tuple[datetime, datetime]],
+    window_start: datetime,
+    window_end: datetime,
+) -> dict[str, float]:
+    events = _clipped_events(work_intervals, window_start, window_end, 1, 0)
+    events += _clipped_events(idle_intervals, window_start, window_end, 0, 1)
+    events.sort(key=lambda event: event[0])
+
+    open_work = 0
+    open_idle = 0
+    net_focus_minutes = 0.0
+    idle_within_session_minutes = 0.0
+    longest_focus_block = 0.0
+    current_focus_block = 0.0
+    previous: datetime | None = None
+
+    for moment, work_delta, idle_delta in events:
+        if previous is not None and moment > previous:
+            span = minutes_between(previous, moment)
+            if open_work > 0 and open_idle == 0:
+                net_focus_minutes += span
+                current_focus_block += span
+                longest_focus_block = max(longest_focus_block, current_focus_block)
+            else:
+                if open_work > 0:
+                    idle_within_session_minutes += span
+                current_focus_block = 0.0
+        open_work += work_delta
+        open_idle += idle_delta
+        previous = moment
+
+    return {
+        "net_focus_minutes": round(net_focus_minutes, 2),
+        "idle_within_session_minutes": round(idle_within_session_minutes, 2),
+        "longest_focus_block_minutes": round(longest_focus_block, 2),
+    }
+
+
+def split_intervals(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    bin_minutes: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    keep = ends > starts
+    interval_index = np.flatnonzero(keep)
+    starts = starts[keep]
+    ends = ends[keep]
+
+    first_bin = np.floor(starts / bin_minutes).astype(np.int64)
+    last_bin = np.ceil(ends / bin_minutes).astype(np.int64) - 1
+    spans = last_bin - first_bin + 1
+
+    owner = np.repeat(np.arange(spans.size), spans)
+    offsets = np.arange(int(spans.sum())) - np.repeat(np.cumsum(spans) - spans, spans)
+    bins = first_bin[owner] + offsets
+
+    overlap = np.minimum(ends[owner], (bins + 1) * bin_minutes) - np.maximum(
+        starts[owner], bins * bin_minutes
+    )
+    return interval_index[owner], bins, overlap
+
+
+def hour_of_week_overlaps(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    range_minutes: float,
+    origin_weekday: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    owner, hour, overlap = split_intervals(
+        np.clip(starts, 0.0, range_minutes), np.clip(ends, 0.0, range_minutes), 60.0
+    )
+    cell = ((origin_weekday + hour // 24) % 7) * 24 + hour % 24
+    return owner, cell, overlap
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+
+
+@dataclass
+class RouteStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class LoadRecorder:
+    def __init__(self) -> None:
+        self.routes: dict[str, RouteStats] = defaultdict(RouteStats)
+
+    async def request(
+        self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        stats = self.routes[route]
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+            stats.errors += 1
+            return None
+
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.status_counts[response.status_code] += 1
+        if response.status_code >= 400:
+            stats.errors += 1
+        return response
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def print_report(recorder: LoadRecorder, elapsed_seconds: float) -> None:
+    header = f"{'route':<32} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for route, stats in sorted(recorder.routes.items()):
+        latencies = sorted(stats.latencies_ms)
+        total = len(latencies)
+        error_rate = stats.errors / total if total else 0.0
+        print(
+            f"{route:<32} {total:>9} {total / elapsed_seconds:>9.1f} "
+            f"{_percentile(latencies, 0.50):>9.1f} {_percentile(latencies, 0.95):>9.1f} "
+            f"{_percentile(latencies, 0.99):>9.1f} {error_rate:>7.1%}"
+        )
+        unexpected = {status: count for status, count in stats.status_counts.items() if status >= 400}
+        if unexpected:
+            print(f"{'':<32} status codes: {dict(sorted(unexpected.items()))}")
+
+
+async def login_user(client: httpx.AsyncClient, recorder: LoadRecorder, username: str) -> str | None:
+    password = "LoadTest123!"
+    await recorder.request(
+        client,
+        "POST /auth/register",
+        "POST",
+        "/auth/register",
+        json={"username": username, "email": f"{username}@loadtest.local", "password": password},
+    )
+    response = await recorder.request(
+        client,
+        "POST /auth/login",
+        "POST",
+        "/auth/login",
+        json={"username": username, "password": password},
+    )
+    if response is None or response.status_code != 200:
+        return None
+    return response.json()["access_token"]
+
+
+def _random_work_log(rng: random.Random, history_days: int) -> dict[str, object]:
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    started_at = today - timedelta(days=rng.randint(1, history_days), minutes=rng.randint(0, 20 * 60))
+    duration = rng.randint(15, 240)
+    return {
+        "session_started_at": started_at.isoformat(),
+        "session_ended_at": (started_at + timedelta(minutes=duration, seconds=rng.random())).isoformat(),
+        "active_minutes": rng.uniform(0, duration),
+        "deep_work_minutes": rng.uniform(0, duration / 2),
+        "context_switch_count": rng.randint(0, 20),
+        "assigned_tasks": rng.randint(0, 4),
+        "completed_tasks": rng.randint(0, 3),
+        "break_minutes": rng.uniform(0, 15),
+    }
+
+
+async def run_agent(
+    client: httpx.AsyncClient,
+    recorder: LoadRecorder,
+    token: str,
+    deadline: float,
+    think_seconds: float,
+    history_days: int,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        if rng.random() < 0.8:
+            await recorder.request(
+                client,
+                "POST /activity/work-logs",
+                "POST",
+                "/activity/work-logs",
+                json=_random_work_log(rng, history_days),
+                headers=headers,
+            )
+        else:
+            started_at = datetime.now(timezone.utc) - timedelta(
+                days=rng.randint(1, history_days), hours=rng.random()
+            )
+            await recorder.request(
+                client,
+                "POST /activity/idle-episodes",
+                "POST",
+                "/activity/idle-episodes",
+                json={
+                    "idle_started_at": started_at.isoformat(),
+                    "idle_ended_at": (started_at + timedelta(minutes=rng.randint(5, 45))).isoformat(),
+                },
+                headers=headers,
+            )
+        await asyncio.sleep(rng.expovariate(1 / think_seconds) if think_seconds > 0 else 0)
+
+
+async def run_manager(
+    client: httpx.AsyncClient,
+    recorder: LoadRecorder,
+    token: str,
+    deadline: float,
+    think_seconds: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    routes = [
+        ("GET /activity/me/burnout", "/activity/me/burnout", {"lookback_days": 14}),
+        ("GET /activity/me/daily-summary", "/activity/me/daily-summary", {}),
+        ("GET /activity/me/anomaly", "/activity/me/anomaly", {"lookback_days": 30}),
+        ("GET /activity/me/heatmap", "/activity/me/heatmap", {"weeks": 4}),
+    ]
+    while time.perf_counter() < deadline:
+        route, url, params = rng.choices(routes, weights=[0.5, 0.3, 0.1, 0.1])[0]
+        await recorder.request(client, route, "GET", url, params=params, headers=headers)
+        await asyncio.sleep(rng.expovariate(1 / think_seconds) if think_seconds > 0 else 0)
+
+
+async def _gather_limited(coroutines: list, limit: int) -> list:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+
+async def run_load(args: argparse.Namespace) -> None:
+    run_id = uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        setup_recorder = LoadRecorder()
+        user_count = args.agents + args.managers
+        print(f"Registering and logging in {user_count} users...")
+        setup_started = time.perf_counter()
+        tokens = await _gather_limited(
+            [login_user(client, setup_recorder, f"load_{run_id}_{index}") for index in range(user_count)],
+            args.connections,
+        )
+        print_report(setup_recorder, time.perf_counter() - setup_started)
+        agent_tokens = [token for token in tokens[: args.agents] if token]
+        manager_tokens = [token for token in tokens[args.agents :] if token]
+        if not agent_tokens and not manager_tokens:
+            print("No users could log in; aborting.")
+            return
+
+        recorder = LoadRecorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        print(f"\nRunning {len(agent_tokens)} agents and {len(manager_tokens)} managers for {args.duration}s...")
+        await asyncio.gather(
+            *(
+                run_agent(client, recorder, token, deadline, args.agent_think, args.history_days, index)
+                for index, token in enumerate(agent_tokens)
+            ),
+            *(
+                run_manager(client, recorder, token, deadline, args.manager_think, index)
+                for index, token in enumerate(manager_tokens)
+            ),
+        )
+        print()
+        print_report(recorder, time.perf_counter() - started)
+
+
+def _start_server(args: argparse.Namespace) -> subprocess.Popen:
+    host, _, port = args.base_url.split("://", 1)[-1].partition(":")
+    # Every synthetic user registers from the same address, so lift the per-IP auth limit by default.
+    environment = {
+        "AUTH_RATE_PER_SECOND": "1000",
+        "AUTH_BURST": "100000",
+        **os.environ,
+        "DATABASE_URL": args.database_url,
+    }
+    if args.shards:
+        environment["ACTIVITY_SHARD_URLS"] = ",".join(
+            f"sqlite:///./loadtest_shard{index}.db" for index in range(args.shards)
+        )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", host, "--port", port or "8000"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=environment,
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"{args.base_url}/", timeout=0.5).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start in time.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate agents and dashboards against the API.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--managers", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--agent-think", type=float, default=1.0, help="Mean seconds between agent posts.")
+    parser.add_argument("--manager-think", type=float, default=2.0, help="Mean seconds between dashboard polls.")
+    parser.add_argument("--history-days", type=int, default=30)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--start-server", action="store_true", help="Start uvicorn locally for the run.")
+    parser.add_argument("--database-url", default="sqlite:///./loadtest.db")
+    parser.add_argument("--shards", type=int, default=0, help="Local SQLite activity shards for --start-server.")
+    args = parser.parse_args()
+
+    server = _start_server(args) if args.start_server else None
+    try:
+        asyncio.run(run_load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,140 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+from pathlib import Path
 from statistics import mean, pstdev
 
+import numpy as np
+
+from app.config import settings
+
+ANOMALY_FEATURE_KEYS = (
+    "deep_work_norm",
+    "engagement_norm",
+    "task_completion_norm",
+    "switch_norm",
+    "isolation_rate",
+)
+_ARTIFACT_PATTERN = re.compile(r"^isolation_forest_v(\d+)\.joblib$")
+
+
+def feature_matrix(feature_history: list[dict[str, float]]) -> list[list[float]]:
+    return [
+        [float(day.get(key, 0.0)) for key in ANOMALY_FEATURE_KEYS]
+        for day in feature_history
+    ]
+
+
+def _latest_artifact_version(model_dir: Path) -> int:
+    if not model_dir.is_dir():
+        return 0
+    versions = [
+        int(match.group(1))
+        for match in (_ARTIFACT_PATTERN.match(path.name) for path in model_dir.iterdir())
+        if match
+    ]
+    return max(versions, default=0)
+
+
+def _average_path_length(sample_counts: np.ndarray) -> np.ndarray:
+    counts = np.asarray(sample_counts, dtype=np.float64)
+    lengths = np.zeros_like(counts)
+    lengths[counts == 2] = 1.0
+    many = counts > 2
+    harmonic = np.log(counts[many] - 1.0) + np.euler_gamma
+    lengths[many] = 2.0 * harmonic - 2.0 * (counts[many] - 1.0) / counts[many]
+    return lengths
+
+
+def _forest_arrays(model) -> dict[str, np.ndarray]:
+    children_left, children_right, features, thresholds, path_lengths, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator, estimator_features in zip(model.estimators_, model.estimators_features_):
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        is_leaf = left == -1
+
+        depth = np.zeros(tree.node_count, dtype=np.float64)
+        for node in np.flatnonzero(~is_leaf):
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+
+        roots.append(offset)
+        children_left.append(np.where(is_leaf, -1, left + offset))
+        children_right.append(np.where(is_leaf, -1, right + offset))
+        features.append(np.where(is_leaf, 0, np.asarray(estimator_features)[np.maximum(tree.feature, 0)]))
+        thresholds.append(tree.threshold.astype(np.float64))
+        path_lengths.append(np.where(is_leaf, depth + _average_path_length(tree.n_node_samples), 0.0))
+        offset += tree.node_count
+
+    return {
+        "roots": np.array(roots, dtype=np.int64),
+        "children_left": np.concatenate(children_left),
+        "children_right": np.concatenate(children_right),
+        "feature": np.concatenate(features).astype(np.int64),
+        "threshold": np.concatenate(thresholds),
+        "leaf_path_length": np.concatenate(path_lengths),
+    }
+
+
+def save_population_model(model, sample_count: int, model_dir: str | None = None) -> Path:
+    import joblib
+
+    directory = Path(model_dir or settings.anomaly_model_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = _latest_artifact_version(directory) + 1
+    path = directory / f"isolation_forest_v{version}.joblib"
+    artifact = {
+        "version": version,
+        "feature_keys": ANOMALY_FEATURE_KEYS,
+        "sample_count": sample_count,
+        "offset": float(model.offset_),
+        "average_path_length": float(_average_path_length([model.max_samples_])[0]),
+        **_forest_arrays(model),
+    }
+    joblib.dump(artifact, path)
+    return path
+
+
+@lru_cache(maxsize=1)
+def load_population_model() -> dict[str, object] | None:
+    try:
+        import joblib
+    except ImportError:
+        return None
+
+    directory = Path(settings.anomaly_model_dir)
+    version = settings.anomaly_model_version or _latest_artifact_version(directory)
+    path = directory / f"isolation_forest_v{version}.joblib"
+    if not path.is_file():
+        return None
+
+    artifact = joblib.load(path, mmap_mode="r")
+    if tuple(artifact.get("feature_keys", ())) != ANOMALY_FEATURE_KEYS or "roots" not in artifact:
+        return None
+    return artifact
+
+
+def population_decision_scores(artifact: dict[str, object], matrix: list[list[float]]) -> np.ndarray:
+    samples = np.asarray(matrix, dtype=np.float32)
+    left = artifact["children_left"]
+    right = artifact["children_right"]
+    feature = artifact["feature"]
+    threshold = artifact["threshold"]
+
+    nodes = np.repeat(np.asarray(artifact["roots"])[:, None], len(samples), axis=1)
+    sample_index = np.broadcast_to(np.arange(len(samples)), nodes.shape)
+    while True:
+        internal = left[nodes] != -1
+        if not internal.any():
+            break
+        goes_left = samples[sample_index, feature[nodes]] <= threshold[nodes]
+        nodes = np.where(internal, np.where(goes_left, left[nodes], right[nodes]), nodes)
+
+    mean_path_length = artifact["leaf_path_length"][nodes].mean(axis=0)
+    return -(2.0 ** (-mean_path_length / artifact["average_path_length"])) - artifact["offset"]
+
 
 def _zscore_fallback(values: list[float]) -> tuple[bool, float]:
     if len(values) < 3:
@@ -18,7 +151,14 @@ def _zscore_fallback(values: list[float]) -> tuple[bool, float]:
 
 
 def detect_anomaly(feature_history: list[dict[str, float]], lookback_days: int) -> dict[str, object]:
-    if len(feature_history) < 3:
+    score_values = [float(day.get("productivity_score", 0.0)) for day in feature_history]
+    return detect_anomaly_from_matrix(feature_matrix(feature_history), score_values, lookback_days)
+
+
+def detect_anomaly_from_matrix(
+    matrix: list[list[float]], score_values: list[float], lookback_days: int
+) -> dict[str, object]:
+    if len(matrix) < 3:
         return {
             "is_anomaly": False,
             "method": "insufficient_data",
@@ -27,17 +167,17 @@ def detect_anomaly(feature_history: list[dict[str, float]], lookback_days: int)
             "lookback_days": lookback_days,
         }
 
-    ordered_keys = [
-        "deep_work_norm",
-        "engagement_norm",
-        "task_completion_norm",
-        "switch_norm",
-        "isolation_rate",
-    ]
-    matrix = [
-        [float(day.get(key, 0.0)) for key in ordered_keys]
-        for day in feature_history
-    ]
+    population_model = load_population_model()
+    if population_model is not None:
+        decision_score = float(population_decision_scores(population_model, [matrix[-1]])[0])
+        return {
+            "is_anomaly": decision_score < 0,
+            "method": "population_isolation_forest",
+            "anomaly_score": round(decision_score, 4),
+            "details": f"Scored with population model v{population_model['version']}. "
+            "Lower decision score means more anomalous behavior.",
+            "lookback_days": lookback_days,
+        }
 
     try:
         from sklearn.ensemble import IsolationForest
@@ -58,7 +198,6 @@ def detect_anomaly(feature_history: list[dict[str, float]], lookback_days: int)
             "lookback_days": lookback_days,
         }
     except Exception:
-        score_values = [float(day.get("productivity_score", 0.0)) for day in feature_history]
         is_anomaly, zscore = _zscore_fallback(score_values)
         return {
             "is_anomaly": is_anomaly,
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from statistics import mean
 
+BURNOUT_FEATURE_KEYS = (
+    "late_night_minutes",
+    "weekend_minutes",
+    "engagement_norm",
+    "break_minutes",
+    "tracked_minutes",
+    "deep_work_minutes",
+)
+
 
 def _linear_slope(values: list[float]) -> float:
     n = len(values)
@@ -18,7 +28,15 @@ def _linear_slope(values: list[float]) -> float:
 
 
 def detect_burnout(daily_summaries: list[dict[str, float]], lookback_days: int) -> dict[str, object]:
-    if not daily_summaries:
+    columns = {
+        key: [float(day.get(key, 0.0)) for day in daily_summaries]
+        for key in BURNOUT_FEATURE_KEYS
+    }
+    return detect_burnout_from_columns(columns, lookback_days)
+
+
+def detect_burnout_from_columns(columns: Mapping[str, Sequence[float]], lookback_days: int) -> dict[str, object]:
+    if not columns["tracked_minutes"]:
         return {
             "risk_level": "low",
             "risk_score": 0,
@@ -26,18 +44,16 @@ def detect_burnout(daily_summaries: list[dict[str, float]], lookback_days: int)
             "lookback_days": lookback_days,
         }
 
-    late_night_avg = mean(float(day.get("late_night_minutes", 0.0)) for day in daily_summaries)
-    weekend_work_days = sum(1 for day in daily_summaries if float(day.get("weekend_minutes", 0.0)) > 0)
+    late_night_avg = mean(columns["late_night_minutes"])
+    weekend_work_days = sum(1 for minutes in columns["weekend_minutes"] if minutes > 0)
     over_engaged_no_break_days = sum(
         1
-        for day in daily_summaries
-        if float(day.get("engagement_norm", 0.0)) >= 0.8
-        and float(day.get("break_minutes", 0.0)) <= 15
-        and float(day.get("tracked_minutes", 0.0)) >= 360
-    )
-    deep_work_slope = _linear_slope(
-        [float(day.get("deep_work_minutes", 0.0)) for day in daily_summaries]
+        for engagement, break_minutes, tracked in zip(
+            columns["engagement_norm"], columns["break_minutes"], columns["tracked_minutes"]
+        )
+        if engagement >= 0.8 and break_minutes <= 15 and tracked >= 360
     )
+    deep_work_slope = _linear_slope(list(columns["deep_work_minutes"]))
 
     risk_score = 0
     factors: list[str] = []
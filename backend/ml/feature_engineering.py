@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from app.config import settings
 from app.utils import clamp, safe_divide
+from ml.scoring_parameters import DEFAULT_SCORING_PARAMETERS, ScoringParameters
 
 
-def build_feature_vector(aggregates: dict[str, float]) -> dict[str, float]:
+def build_feature_vector(
+    aggregates: dict[str, float], parameters: ScoringParameters = DEFAULT_SCORING_PARAMETERS
+) -> dict[str, float]:
     tracked_minutes = max(aggregates.get("tracked_minutes", 0.0), 0.0)
     active_minutes = max(aggregates.get("active_minutes", 0.0), 0.0)
     deep_work_minutes = max(aggregates.get("deep_work_minutes", 0.0), 0.0)
@@ -14,7 +16,7 @@ def build_feature_vector(aggregates: dict[str, float]) -> dict[str, float]:
     isolation_minutes = max(aggregates.get("total_isolation_minutes", 0.0), 0.0)
 
     deep_work_norm = clamp(
-        safe_divide(deep_work_minutes, float(settings.deep_work_target_minutes))
+        safe_divide(deep_work_minutes, float(parameters.deep_work_target_minutes))
     )
 
     manual_engagement = aggregates.get("engagement_score")
@@ -28,7 +30,7 @@ def build_feature_vector(aggregates: dict[str, float]) -> dict[str, float]:
     else:
         task_completion_norm = clamp(safe_divide(completed_tasks, assigned_tasks))
 
-    switch_norm = clamp(safe_divide(context_switch_count, float(settings.context_switch_target)))
+    switch_norm = clamp(safe_divide(context_switch_count, float(parameters.context_switch_target)))
     isolation_rate = clamp(safe_divide(isolation_minutes, tracked_minutes))
 
     return {
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-from app.config import settings
+import numpy as np
+
 from app.utils import clamp
+from ml.scoring_parameters import DEFAULT_SCORING_PARAMETERS, ScoringParameters
 
 
-def calculate_productivity_score(features: dict[str, float]) -> tuple[float, dict[str, float]]:
-    deep_work_component = settings.deep_work_weight * features.get("deep_work_norm", 0.0)
-    engagement_component = settings.engagement_weight * features.get("engagement_norm", 0.0)
-    task_component = settings.task_weight * features.get("task_completion_norm", 0.0)
-    switch_component = settings.switch_penalty * features.get("switch_norm", 0.0)
+def calculate_productivity_score(
+    features: dict[str, float], parameters: ScoringParameters = DEFAULT_SCORING_PARAMETERS
+) -> tuple[float, dict[str, float]]:
+    deep_work_component = parameters.deep_work_weight * features.get("deep_work_norm", 0.0)
+    engagement_component = parameters.engagement_weight * features.get("engagement_norm", 0.0)
+    task_component = parameters.task_weight * features.get("task_completion_norm", 0.0)
+    switch_component = parameters.switch_penalty * features.get("switch_norm", 0.0)
 
     score_raw = deep_work_component + engagement_component + task_component - switch_component
     score_normalized = clamp(score_raw)
@@ -21,3 +25,38 @@ def calculate_productivity_score(features: dict[str, float]) -> tuple[float, dic
         "switch_penalty_component": round(switch_component, 4),
         "score_raw": round(score_raw, 4),
     }
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray | float) -> np.ndarray:
+    denominator = np.broadcast_to(np.asarray(denominator, dtype=np.float64), numerator.shape)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+
+def _round(values: np.ndarray, ndigits: int) -> np.ndarray:
+    # Matches round() exactly; np.round scales by 10**ndigits first and can differ on ties.
+    return np.fromiter((round(value, ndigits) for value in values.tolist()), dtype=np.float64, count=values.size)
+
+
+def score_day_values(
+    values: dict[str, np.ndarray], parameters: ScoringParameters = DEFAULT_SCORING_PARAMETERS
+) -> dict[str, np.ndarray]:
+    deep_work_minutes = np.maximum(values["deep_work_minutes"], 0.0)
+    context_switch_count = np.maximum(values["context_switch_count"], 0.0)
+    deep_work_norm = _round(
+        np.clip(_safe_divide(deep_work_minutes, float(parameters.deep_work_target_minutes)), 0.0, 1.0), 4
+    )
+    switch_norm = _round(
+        np.clip(_safe_divide(context_switch_count, float(parameters.context_switch_target)), 0.0, 1.0), 4
+    )
+
+    score_raw = (
+        parameters.deep_work_weight * deep_work_norm
+        + parameters.engagement_weight * values["engagement_norm"]
+        + parameters.task_weight * values["task_completion_norm"]
+        - parameters.switch_penalty * switch_norm
+    )
+    return {
+        "deep_work_norm": deep_work_norm,
+        "switch_norm": switch_norm,
+        "productivity_score": _round(np.clip(score_raw, 0.0, 1.0) * 100, 2),
+    }
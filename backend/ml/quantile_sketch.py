@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+DEFAULT_SKETCH_K = 200
+
+
+class KLLSketch:
+    __slots__ = ("k", "count", "levels", "_coin")
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K) -> None:
+        self.k = k
+        self.count = 0
+        self.levels: list[list[float]] = [[]]
+        self._coin = 0
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def update(self, value: float) -> None:
+        self.levels[0].append(float(value))
+        self.count += 1
+        self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                kept = items[-1:] if len(items) % 2 else []
+                paired = items[: len(items) - len(kept)]
+                self.levels[level + 1].extend(paired[self._coin :: 2])
+                self.levels[level] = kept
+                self._coin ^= 1
+            level += 1
+
+    def _sorted_items(self) -> tuple[np.ndarray, np.ndarray]:
+        values = np.array([value for items in self.levels for value in items], dtype=np.float64)
+        weights = np.concatenate(
+            [np.full(len(items), 2**level, dtype=np.int64) for level, items in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def rank(self, value: float) -> float | None:
+        if not self.count:
+            return None
+        values, cumulative = self._sorted_items()
+        below = np.searchsorted(values, value, side="left")
+        at_or_below = np.searchsorted(values, value, side="right")
+        below_weight = cumulative[below - 1] if below else 0
+        at_or_below_weight = cumulative[at_or_below - 1] if at_or_below else 0
+        return float(below_weight + at_or_below_weight) / (2 * self.count)
+
+    def quantile(self, fraction: float) -> float | None:
+        if not self.count:
+            return None
+        values, cumulative = self._sorted_items()
+        index = np.searchsorted(cumulative, fraction * self.count, side="left")
+        return float(values[min(index, len(values) - 1)])
+
+    def to_bytes(self) -> bytes:
+        header = np.array(
+            [self.k, self.count, self._coin, *(len(items) for items in self.levels)], dtype="<i8"
+        )
+        values = np.array([value for items in self.levels for value in items], dtype="<f8")
+        return np.array([len(header)], dtype="<i8").tobytes() + header.tobytes() + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> KLLSketch:
+        header_length = int(np.frombuffer(payload, dtype="<i8", count=1)[0])
+        header = np.frombuffer(payload, dtype="<i8", count=header_length, offset=8)
+        values = np.frombuffer(payload, dtype="<f8", offset=8 * (header_length + 1))
+
+        sketch = cls(int(header[0]))
+        sketch.count = int(header[1])
+        sketch._coin = int(header[2])
+        sketch.levels = []
+        offset = 0
+        for length in header[3:].tolist():
+            sketch.levels.append(values[offset : offset + length].tolist())
+            offset += length
+        return sketch
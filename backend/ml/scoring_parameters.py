@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class ScoringParameters:
+    name: str
+    version: int
+    deep_work_target_minutes: int
+    context_switch_target: int
+    deep_work_weight: float
+    engagement_weight: float
+    task_weight: float
+    switch_penalty: float
+
+
+DEFAULT_SCORING_PARAMETERS = ScoringParameters(
+    name="default",
+    version=0,
+    deep_work_target_minutes=settings.deep_work_target_minutes,
+    context_switch_target=settings.context_switch_target,
+    deep_work_weight=settings.deep_work_weight,
+    engagement_weight=settings.engagement_weight,
+    task_weight=settings.task_weight,
+    switch_penalty=settings.switch_penalty,
+)